@@ -1,22 +1,51 @@
 import os
 import random
 
-import requests
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 
+from backend.app.response_cache import ResponseCache
+from backend.blockchain.block_store import BlockStore
 from backend.blockchain.blockchain import Blockchain
+from backend.blockchain.codec import MEDIA_TYPE
+from backend.config import (
+    BLOCKCHAIN_PAGE_LIMIT,
+    HISTORY_PAGE_LIMIT,
+    KNOWN_ADDRESSES_PAGE_LIMIT,
+    MINING_PROCESSES,
+    SYNC_BATCH_SIZE,
+)
+from backend.events import EventStream
+from backend.mining import MiningService
 from backend.pubsub import PubSub
+from backend.sync import encode_sync_batch, synchronize
 from backend.wallet.transaction import Transaction
 from backend.wallet.transaction_pool import TransactionPool
 from backend.wallet.wallet import Wallet
 
 app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": "http://localhost:3000"}})
-blockchain = Blockchain()
+# Keep the key order of the block data, the block hashes are computed over it.
+app.json.sort_keys = False  # type: ignore
+CORS(
+    app,
+    resources={r"/*": {"origins": "http://localhost:3000"}},
+    expose_headers=["X-Next-Cursor"],
+)
+blockchain = Blockchain(int(os.environ.get("MINING_PROCESSES", MINING_PROCESSES)))
+
+if os.environ.get("BLOCK_STORE"):
+    BlockStore(os.environ["BLOCK_STORE"]).attach(blockchain)
+
 wallet = Wallet(blockchain)
 transaction_pool = TransactionPool()
 pubsub = PubSub(blockchain, transaction_pool)
+mining_service = MiningService(blockchain, transaction_pool, wallet, pubsub)
+pubsub.listener.mining_service = mining_service
+events = EventStream()
+events.watch_blockchain(blockchain)
+events.watch_transaction_pool(transaction_pool)
+response_cache = ResponseCache()
+response_cache.watch_blockchain(blockchain)
 
 
 @app.route("/")
@@ -24,35 +53,140 @@ def route_default():
     return "Welcome to the blockchain"
 
 
+def stream_json_array(blocks):
+    """
+    Serialize the blocks as a JSON array, one block at a time.
+    """
+    yield "["
+
+    for i, block in enumerate(blocks):
+        yield ("," if i else "") + block.serialize()
+
+    yield "]"
+
+
+@app.route("/events")
+def route_events():
+    subscriber = events.subscribe()
+
+    return Response(
+        events.stream(subscriber),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @app.route("/blockchain")
+@response_cache.cached
 def route_blockchain():
-    return jsonify(blockchain.to_json())
+    return Response(stream_json_array(blockchain.chain), mimetype="application/json")
+
+
+@app.route("/blockchain/stream")
+def route_blockchain_stream():
+    blocks = (block.serialize() + "\n" for block in blockchain.chain)
+
+    return Response(blocks, mimetype="application/x-ndjson")
+
+
+@app.route("/blockchain/page")
+def route_blockchain_page():
+    # http://localhost:5000/blockchain/page?cursor=100&limit=50
+    cursor = int(request.args.get("cursor", 0))
+    limit = min(int(request.args.get("limit", BLOCKCHAIN_PAGE_LIMIT)), BLOCKCHAIN_PAGE_LIMIT)
+    blocks, next_cursor = blockchain.page(cursor, limit)
+
+    return jsonify({"blocks": [block.to_json() for block in blocks], "next_cursor": next_cursor})
 
 
 @app.route("/blockchain/range")
+@response_cache.cached
 def route_blockchain_range():
     # http://localhost:5000/blockchain/range?start=2&end=5
     start = int(request.args.get("start"))
     end = int(request.args.get("end"))
 
-    return jsonify(blockchain.to_json()[::-1][start:end])
+    return jsonify([block.to_json() for block in blockchain.range_from_tip(start, end)])
+
+
+@app.route("/blockchain/sync", methods=["POST"])
+def route_blockchain_sync():
+    sync_request = request.get_json()
+    limit = min(int(sync_request.get("limit", SYNC_BATCH_SIZE)), SYNC_BATCH_SIZE)
+    height, blocks, more = blockchain.blocks_after(sync_request["locator"], limit)
+
+    if request.accept_mimetypes.best == MEDIA_TYPE:
+        return Response(encode_sync_batch(height, blocks, more), mimetype=MEDIA_TYPE)
+
+    return jsonify(
+        {"height": height, "blocks": [block.to_json() for block in blocks], "more": more}
+    )
 
 
 @app.route("/blockchain/length")
+@response_cache.cached
 def route_blockchain_length():
     return jsonify(len(blockchain.chain))
 
 
+@app.route("/block/<block_hash>")
+def route_block(block_hash):
+    # http://localhost:5000/block/0000f1e2...
+    found = blockchain.find_block(block_hash)
+
+    if found is None:
+        return jsonify({"error": f"Unknown block {block_hash}"}), 404
+
+    height, block = found
+
+    return jsonify({"height": height, "block": block.to_json()})
+
+
+@app.route("/transaction/<transaction_id>")
+def route_transaction(transaction_id):
+    # http://localhost:5000/transaction/ab12cd34
+    found = blockchain.find_transaction(transaction_id)
+
+    if found is None:
+        return jsonify({"error": f"Unknown transaction {transaction_id}"}), 404
+
+    return jsonify(found)
+
+
 @app.route("/blockchain/mine")
 def route_blockchain_mine():
-    transaction_data = transaction_pool.transaction_data()
-    transaction_data.append(Transaction.reward_transaction(wallet).to_json())
-    blockchain.add_block(transaction_data)
-    block = blockchain.chain[-1]
-    pubsub.broadcast_block(block)
-    transaction_pool.clear_blockchain_transactions(blockchain)
+    job = mining_service.submit()
+
+    return jsonify(job.to_json()), 202
+
+
+@app.route("/mining/jobs/<job_id>")
+def route_mining_job(job_id):
+    job = mining_service.get_job(job_id)
+
+    if not job:
+        return jsonify({"error": f"Unknown mining job {job_id}"}), 404
+
+    return jsonify(job.to_json())
+
+
+@app.route("/mining/start", methods=["POST"])
+def route_mining_start():
+    mining_service.start()
+
+    return jsonify(mining_service.status())
+
 
-    return jsonify(block.to_json())
+@app.route("/mining/stop", methods=["POST"])
+def route_mining_stop():
+    mining_service.stop()
+
+    return jsonify(mining_service.status())
+
+
+@app.route("/mining/status")
+def route_mining_status():
+    return jsonify(mining_service.status())
 
 
 @app.route("/wallet/transact", methods=["POST"])
@@ -65,8 +199,12 @@ def route_wallet_transact():
     else:
         transaction = Transaction(wallet, transaction_data["recipient"], transaction_data["amount"])
 
+    try:
+        transaction_pool.set_transaction(transaction)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 503
+
     pubsub.broadcast_transaction(transaction)
-    transaction_pool.set_transaction(transaction)
 
     return jsonify(transaction.to_json())
 
@@ -76,15 +214,42 @@ def route_wallet_info():
     return jsonify({"address": wallet.address, "balance": wallet.balance})
 
 
+@app.route("/wallet/public-key-cache")
+def route_wallet_public_key_cache():
+    return jsonify(Wallet.public_key_cache_info())
+
+
+@app.route("/wallet/history")
+def route_wallet_history():
+    # http://localhost:5000/wallet/history?address=ab12cd34&cursor=200&limit=50
+    address = request.args.get("address", wallet.address)
+    cursor = request.args.get("cursor")
+    limit = min(int(request.args.get("limit", HISTORY_PAGE_LIMIT)), HISTORY_PAGE_LIMIT)
+    history, next_cursor = blockchain.transaction_history(
+        address, int(cursor) if cursor is not None else None, limit
+    )
+
+    return jsonify({"history": history, "next_cursor": next_cursor})
+
+
 @app.route("/known-addresses")
+@response_cache.cached
 def route_known_addresses():
-    known_addresses = set()
+    # http://localhost:5000/known-addresses?prefix=ab&cursor=ab12cd34&limit=50
+    # At most KNOWN_ADDRESSES_PAGE_LIMIT addresses are returned. When more match,
+    # the X-Next-Cursor header holds the cursor of the next page.
+    limit = min(
+        int(request.args.get("limit", KNOWN_ADDRESSES_PAGE_LIMIT)), KNOWN_ADDRESSES_PAGE_LIMIT
+    )
+    known_addresses, next_cursor = blockchain.known_addresses(
+        request.args.get("prefix", ""), request.args.get("cursor"), limit
+    )
+    response = jsonify(known_addresses)
 
-    for block in blockchain.chain:
-        for transaction in block.data:
-            known_addresses.update(transaction["output"].keys())
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
 
-    return jsonify(list(known_addresses))
+    return response
 
 
 @app.route("/transactions")
@@ -98,11 +263,8 @@ PORT = ROOT_PORT
 if os.environ.get("PEER") == "True":
     PORT = random.randint(5001, 6000)
 
-    result = requests.get(f"http://localhost:{ROOT_PORT}/blockchain")
-    result_blockchain = Blockchain.from_json(result.json())
-
     try:
-        blockchain.replace_chain(result_blockchain.chain)
+        synchronize(blockchain, f"http://localhost:{ROOT_PORT}")
         print("\n -- Successfully synchronized the local chain")
     except Exception as e:
         print(f"\n -- Error synchronizing: {e}")
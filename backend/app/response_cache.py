@@ -0,0 +1,106 @@
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import Response, current_app, request
+
+from backend.config import RESPONSE_CACHE_SIZE
+
+
+class ResponseCache:
+    """
+    Caches the responses of endpoints that only read the chain, keyed by
+    the path, the query arguments and the hash of the tip, since their
+    content only changes when the tip does. The cache is cleared whenever
+    the chain changes.
+
+    Every cached response carries an ETag derived from its key, so a client
+    sending it back in If-None-Match gets a 304 until the tip changes.
+    Streamed responses are not cached, so their body never has to be held
+    in memory; they only get the ETag and the 304.
+    """
+
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.blockchain = None
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def watch_blockchain(self, blockchain):
+        self.blockchain = blockchain
+        blockchain.add_hook(lambda blockchain, height: self.clear())
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is not None:
+                self.entries.move_to_end(key)
+
+            return entry
+
+    def put(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def cached(self, view):
+        """
+        Decorate a view so that its responses are cached until the tip changes.
+        """
+
+        @functools.wraps(view)
+        def cached_view(*args, **kwargs):
+            tip_hash = self.blockchain.chain[-1].hash
+            key = (request.path, tuple(sorted(request.args.items(multi=True))), tip_hash)
+            etag = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:32]
+
+            if etag in request.if_none_match:
+                return self.respond(b"", 304, [], etag)
+
+            entry = self.get(key)
+
+            if entry is None:
+                response = current_app.make_response(view(*args, **kwargs))
+
+                if response.status_code != 200:
+                    return response
+
+                if response.is_streamed:
+                    return self.tag(response, etag)
+
+                headers = [
+                    (name, value)
+                    for name, value in response.headers
+                    if name not in ("Content-Length", "ETag", "Cache-Control")
+                ]
+                entry = (response.get_data(), headers)
+
+                # The chain may have changed while the response was built.
+                if self.blockchain.chain[-1].hash == tip_hash:
+                    self.put(key, entry)
+
+            body, headers = entry
+
+            return self.respond(body, 200, headers, etag)
+
+        return cached_view
+
+    @staticmethod
+    def respond(body, status, headers, etag):
+        return ResponseCache.tag(Response(body, status, headers), etag)
+
+    @staticmethod
+    def tag(response, etag):
+        response.set_etag(etag)
+        # Let clients keep the response but check its ETag before reusing it.
+        response.headers["Cache-Control"] = "no-cache"
+
+        return response
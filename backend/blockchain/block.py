@@ -1,9 +1,10 @@
+import json
 import time
-from typing import Any, Dict, List, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from backend.config import MINE_RATE
-from backend.utils.crypto_hash import crypto_hash
-from backend.utils.hex_to_binary import hex_to_binary
+from backend.utils.crypto_hash import CryptoHashMidstate, crypto_hash
+from backend.utils.difficulty import difficulty_target, meets_difficulty
 
 GENESIS_DATA = {
     "timestamp": 1,
@@ -14,13 +15,22 @@ GENESIS_DATA = {
     "nonce": "genesis_nonce",
 }
 
+STOP_CHECK_INTERVAL = 1024
+
 
 class Block:
     """
     Block: a unit of storage.
     Store transactions in a blockchain that supports a cryptocurrency.
+
+    Blocks are slotted to keep their memory footprint small, and are treated
+    as immutable once mined: their JSON encoding is computed once and cached,
+    and the cache is only dropped when a field is reassigned.
     """
 
+    FIELDS = ("timestamp", "last_hash", "hash", "data", "difficulty", "nonce")
+    __slots__ = FIELDS + ("_serialized",)
+
     def __init__(
         self,
         timestamp: int,
@@ -49,6 +59,13 @@ class Block:
         self.difficulty = difficulty
         self.nonce = nonce
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """
+        Set a field of the block, dropping its cached encoding.
+        """
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "_serialized", None)
+
     def __repr__(self) -> str:
         """
         Return a string representation of the Block.
@@ -78,7 +95,7 @@ class Block:
         """
         if not isinstance(other, Block):
             return NotImplemented
-        return self.__dict__ == other.__dict__
+        return self.to_json() == other.to_json()
 
     def to_json(self) -> Dict[str, Any]:
         """
@@ -87,7 +104,26 @@ class Block:
         Returns:
             dict: A dictionary containing Block attributes.
         """
-        return self.__dict__
+        return {
+            "timestamp": self.timestamp,
+            "last_hash": self.last_hash,
+            "hash": self.hash,
+            "data": self.data,
+            "difficulty": self.difficulty,
+            "nonce": self.nonce,
+        }
+
+    def serialize(self) -> str:
+        """
+        Return the JSON encoding of the block, cached after the first call.
+
+        Returns:
+            str: The JSON encoding of to_json().
+        """
+        if self._serialized is None:
+            object.__setattr__(self, "_serialized", json.dumps(self.to_json()))
+
+        return self._serialized
 
     @staticmethod
     def mine_block(last_block: "Block", data: Any) -> "Block":
@@ -102,19 +138,56 @@ class Block:
         Returns:
             Block: The newly mined Block.
         """
+        block = Block.search_nonce(last_block, data)
+
+        if block is None:
+            raise Exception("Mining stopped before a block was found")
+
+        return block
+
+    @staticmethod
+    def search_nonce(
+        last_block: "Block",
+        data: Any,
+        nonce: int = 0,
+        nonce_step: int = 1,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> Optional["Block"]:
+        """
+        Try the nonces nonce, nonce + nonce_step, nonce + 2 * nonce_step, ...
+        until a block hash is found that meets the proof of work requirement.
+        The last_hash and data are serialized once; each attempt only hashes
+        the changing timestamp, difficulty and nonce on top of them.
+
+        Args:
+            last_block (Block): The last Block in the Blockchain.
+            data (List[Any]): Data to be included in the Block.
+            nonce (int): The first nonce to try.
+            nonce_step (int): The distance between two tried nonces.
+            should_stop (Callable[[], bool]): Polled every STOP_CHECK_INTERVAL
+                attempts; the search gives up once it returns True.
+
+        Returns:
+            Optional[Block]: The newly mined Block, or None if the search was stopped.
+        """
         timestamp = time.time_ns()
         last_hash = last_block.hash
         difficulty = Block.adjust_difficulty(last_block, timestamp)
-        nonce = 0
-        hash = crypto_hash(timestamp, last_hash, data, difficulty, nonce)
+        midstate = CryptoHashMidstate(last_hash, data)
+        digest = midstate.digest(timestamp, difficulty, nonce)
+        attempts = 1
+
+        while int.from_bytes(digest, "big") >= difficulty_target(difficulty):
+            if should_stop and attempts % STOP_CHECK_INTERVAL == 0 and should_stop():
+                return None
 
-        while hex_to_binary(hash)[0:difficulty] != "0" * difficulty:
-            nonce += 1
+            nonce += nonce_step
+            attempts += 1
             timestamp = time.time_ns()
             difficulty = Block.adjust_difficulty(last_block, timestamp)
-            hash = crypto_hash(timestamp, last_hash, data, difficulty, nonce)
+            digest = midstate.digest(timestamp, difficulty, nonce)
 
-        return Block(timestamp, last_hash, hash, data, difficulty, nonce)
+        return Block(timestamp, last_hash, digest.hex(), data, difficulty, nonce)
 
     @staticmethod
     def genesis() -> "Block":
@@ -180,7 +253,7 @@ class Block:
         if block.last_hash != last_block.hash:
             raise Exception("The block last_hash must be correct")
 
-        if hex_to_binary(block.hash)[0 : block.difficulty] != "0" * block.difficulty:
+        if not meets_difficulty(block.hash, block.difficulty):
             raise Exception("The proof of work requirement was not met")
 
         if abs(last_block.difficulty - block.difficulty) > 1:
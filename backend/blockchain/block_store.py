@@ -0,0 +1,212 @@
+import json
+import mmap
+import os
+import struct
+from typing import Any, List
+
+from backend.blockchain.block import Block
+from backend.blockchain.codec import decode_block, encode_block
+
+LOG_FILE = "blocks.log"
+INDEX_FILE = "blocks.idx"
+
+RECORD_HEADER = struct.Struct(">I")
+INDEX_ENTRY = struct.Struct(">Q")
+
+
+class BlockStore:
+    """
+    Append-only on-disk storage of the blocks of a chain.
+
+    The log file holds every block as a length-prefixed record, the index file
+    holds the offset of every record as a fixed-width integer. A block is only
+    trusted once its index entry is written, so the index is the checkpoint a
+    node resumes from: anything past it is a partial write and is discarded.
+
+    Records are written in the binary block encoding of the codec module.
+    Records of older stores are JSON, and are still read.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        Open the store in the directory, creating it if needed.
+
+        Args:
+            directory (str): The directory holding the log and index files.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.log = open(os.path.join(directory, LOG_FILE), "a+b")
+        self.index = open(os.path.join(directory, INDEX_FILE), "a+b")
+        self.offsets: List[int] = []
+        self.end = 0
+        self.recover()
+
+    def __len__(self) -> int:
+        """
+        Return the number of stored blocks.
+        """
+        return len(self.offsets)
+
+    def close(self) -> None:
+        """
+        Close the log and index files.
+        """
+        self.log.close()
+        self.index.close()
+
+    def recover(self) -> None:
+        """
+        Read the index and drop whatever was written past the last checkpoint.
+
+        Raises:
+            Exception: If the log is shorter than its index.
+        """
+        index_size = os.fstat(self.index.fileno()).st_size
+        index_size -= index_size % INDEX_ENTRY.size
+        self.index.truncate(index_size)
+
+        if index_size:
+            with mmap.mmap(self.index.fileno(), 0, access=mmap.ACCESS_READ) as index:
+                self.offsets = [offset for (offset,) in INDEX_ENTRY.iter_unpack(index)]
+        else:
+            self.offsets = []
+
+        self.end = self.checkpoint_offset()
+        self.log.truncate(self.end)
+
+    def checkpoint_offset(self) -> int:
+        """
+        Return the offset at which the log ends after the last indexed record.
+
+        Raises:
+            Exception: If the log is shorter than its index.
+        """
+        if not self.offsets:
+            return 0
+
+        self.log.seek(self.offsets[-1])
+        header = self.log.read(RECORD_HEADER.size)
+
+        if len(header) < RECORD_HEADER.size:
+            raise Exception("The block log is shorter than its index")
+
+        (length,) = RECORD_HEADER.unpack(header)
+        end = self.offsets[-1] + RECORD_HEADER.size + length
+
+        if os.fstat(self.log.fileno()).st_size < end:
+            raise Exception("The block log is shorter than its index")
+
+        return end
+
+    def load(self) -> List[Block]:
+        """
+        Read every stored block, memory-mapping the log.
+
+        Returns:
+            List[Block]: The stored blocks, in chain order.
+        """
+        if not self.offsets:
+            return []
+
+        with mmap.mmap(self.log.fileno(), 0, access=mmap.ACCESS_READ) as log:
+            return [self.read_record(log, offset) for offset in self.offsets]
+
+    def read_record(self, log: Any, offset: int) -> Block:
+        """
+        Decode the block stored at the offset of the log.
+
+        Args:
+            log (mmap): The memory-mapped log.
+            offset (int): The offset of the record.
+
+        Returns:
+            Block: The stored Block.
+        """
+        (length,) = RECORD_HEADER.unpack_from(log, offset)
+        start = offset + RECORD_HEADER.size
+        payload = log[start : start + length]
+
+        if payload[:1] == b"{":
+            return Block.from_json(json.loads(payload))
+
+        return decode_block(payload)
+
+    def append(self, blocks: List[Block]) -> None:
+        """
+        Append blocks to the log, then checkpoint them in the index.
+
+        Args:
+            blocks (List[Block]): The Blocks following the last stored block.
+        """
+        if not blocks:
+            return
+
+        offset = self.end
+        offsets = []
+        records = []
+
+        for block in blocks:
+            payload = encode_block(block)
+            records.append(RECORD_HEADER.pack(len(payload)) + payload)
+            offsets.append(offset)
+            offset += RECORD_HEADER.size + len(payload)
+
+        self.write(self.log, b"".join(records))
+        self.write(self.index, b"".join(INDEX_ENTRY.pack(start) for start in offsets))
+        self.offsets.extend(offsets)
+        self.end = offset
+
+    def truncate(self, length: int) -> None:
+        """
+        Drop every stored block from the given height on.
+
+        Args:
+            length (int): The number of blocks to keep.
+        """
+        if length >= len(self.offsets):
+            return
+
+        self.end = self.offsets[length]
+        self.offsets = self.offsets[:length]
+        self.index.truncate(length * INDEX_ENTRY.size)
+        self.log.truncate(self.end)
+
+    def attach(self, blockchain: Any) -> None:
+        """
+        Resume the blockchain from the stored blocks without validating them
+        again, then store every later change of its chain.
+
+        Args:
+            blockchain (Blockchain): The Blockchain to persist.
+        """
+        stored_chain = self.load()
+
+        if stored_chain:
+            blockchain.chain = stored_chain
+        else:
+            self.append(blockchain.chain)
+
+        blockchain.add_hook(lambda blockchain, height: self.sync(blockchain.chain, height))
+
+    def sync(self, chain: List[Block], height: int) -> None:
+        """
+        Store the changes of the chain, starting at the given height.
+        Blocks below the height are already stored, blocks from it on are
+        either new or replace stored blocks of an abandoned fork.
+
+        Args:
+            chain (List[Block]): The chain to store.
+            height (int): The height of the first new or replaced block.
+        """
+        height = min(height, len(self.offsets))
+        self.truncate(height)
+        self.append(chain[height:])
+
+    @staticmethod
+    def write(file: Any, data: bytes) -> None:
+        """
+        Append data to the file and make sure it reached the disk.
+        """
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
@@ -1,9 +1,21 @@
-from typing import Any, Dict, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 from backend.blockchain.block import Block
-from backend.config import MINING_REWARD_INPUT
+from backend.blockchain.location_index import LocationIndex, TransactionIds
+from backend.blockchain.miner import ParallelMiner
+from backend.config import (
+    LOCATOR_DENSE_HASHES,
+    MINING_PROCESSES,
+    MINING_REWARD_INPUT,
+    SIGNATURE_VERIFICATION_BATCH,
+    SIGNATURE_VERIFICATION_THREADS,
+)
+from backend.wallet.address_index import AddressIndex
+from backend.wallet.history_index import HistoryIndex
+from backend.wallet.ledger import Ledger
 from backend.wallet.transaction import Transaction
-from backend.wallet.wallet import Wallet
 
 
 class Blockchain:
@@ -12,17 +24,289 @@ class Blockchain:
     Implemented as a list of blocks - data sets of transactions
     """
 
-    def __init__(self) -> None:
+    def __init__(self, mining_processes: int = MINING_PROCESSES) -> None:
+        """
+        Initialize a Blockchain instance holding only the genesis block.
+
+        Args:
+            mining_processes (int): Number of processes add_block mines on.
+        """
         self.chain = [Block.genesis()]
+        self.ledger = Ledger()
+        self.location_index = LocationIndex()
+        self.address_index = AddressIndex()
+        self.history_index = HistoryIndex()
+        self.miner = ParallelMiner(mining_processes)
+        self.hooks: List[Callable[["Blockchain", int], None]] = []
+        # Held while the chain is validated and changed, and while it is read
+        # together with an index, so neither sees a half-applied change.
+        self.lock = threading.RLock()
 
     def add_block(self, data: Any) -> None:
         """
         Add a new block to the blockchain.
+        The block is mined without holding the lock, and mined again on the
+        new tip if the tip changed in the meantime.
 
         Args:
             data (Any): Data to be included in the block.
         """
-        self.chain.append(Block.mine_block(self.chain[-1], data))
+        while True:
+            last_block = self.chain[-1]
+            block = self.miner.mine_block(last_block, data)
+
+            with self.lock:
+                if self.chain[-1] is last_block:
+                    self.chain.append(block)
+                    self.notify_hooks(len(self.chain) - 1)
+                    return
+
+    def append_block(self, block: Block) -> None:
+        """
+        Append a block received from a peer to the local chain.
+        Only the incoming block is validated, against the current tip,
+        since every block already in the local chain has been validated.
+
+        Args:
+            block (Block): The incoming Block that should extend the local tip.
+
+        Raises:
+            Exception: If the block does not extend the local tip or is invalid.
+        """
+        with self.lock:
+            last_block = self.chain[-1]
+
+            if block.last_hash != last_block.hash:
+                raise Exception("Cannot append. The incoming block must extend the local tip.")
+
+            try:
+                self.is_valid_extension([block])
+            except Exception as e:
+                raise Exception(f"Cannot append. The incoming block is invalid: {e}")
+
+            self.chain.append(block)
+            self.notify_hooks(len(self.chain) - 1)
+
+    def extend_chain(self, blocks: List[Block]) -> None:
+        """
+        Append blocks received from a peer that continue the local tip.
+        Only the incoming blocks are validated.
+
+        Args:
+            blocks (List[Block]): The Blocks following the local tip, in order.
+
+        Raises:
+            Exception: If the blocks are invalid.
+        """
+        if not blocks:
+            return
+
+        with self.lock:
+            try:
+                self.is_valid_extension(blocks)
+            except Exception as e:
+                raise Exception(f"Cannot extend. The incoming blocks are invalid: {e}")
+
+            height = len(self.chain)
+            self.chain.extend(blocks)
+            self.notify_hooks(height)
+
+    def locator(self) -> List[str]:
+        """
+        Describe the local chain to a peer with a few block hashes: the
+        latest ones, then exponentially sparser ones, down to the genesis block.
+
+        Returns:
+            List[str]: The block hashes, newest first.
+        """
+        chain = self.chain
+        hashes = []
+        height = len(chain) - 1
+        step = 1
+
+        while height > 0:
+            hashes.append(chain[height].hash)
+
+            if len(hashes) >= LOCATOR_DENSE_HASHES:
+                step *= 2
+
+            height -= step
+
+        hashes.append(chain[0].hash)
+
+        return hashes
+
+    def blocks_after(self, locator: List[str], limit: int) -> Tuple[int, List[Block], bool]:
+        """
+        Find the blocks a peer is missing, given the locator of its chain.
+        The newest block of the locator found on the local chain is looked
+        up by hash, so the search costs as much as the locator is long.
+
+        Args:
+            locator (List[str]): The block hashes sent by the peer.
+            limit (int): Maximum number of blocks to return.
+
+        Returns:
+            Tuple[int, List[Block], bool]: The height of the first missing
+            block, up to limit missing blocks, and whether more blocks follow.
+        """
+        with self.lock:
+            chain = self.chain
+            self.location_index.sync(chain)
+            block_heights = self.location_index.block_heights
+            height = max(
+                (block_heights[hash] for hash in locator if hash in block_heights), default=0
+            )
+            height += 1
+
+            blocks = chain[height : height + max(limit, 0)]
+
+            return height, blocks, height + len(blocks) < len(chain)
+
+    def is_valid_extension(self, blocks: List[Block]) -> None:
+        """
+        Validate blocks that extend the local tip, in order.
+        Only the new blocks are checked, against the balances already
+        indexed for the local chain. Their signatures are verified up front,
+        in parallel.
+
+        Args:
+            blocks (List[Block]): The Blocks following the local tip.
+
+        Raises:
+            Exception: If any of the blocks is invalid.
+        """
+        self.ledger.sync(self.chain)
+        ledger = self.ledger.copy()
+        self.location_index.sync(self.chain)
+        transaction_ids = self.location_index.transaction_ids()
+        last_block = self.chain[-1]
+        signatures = Blockchain.verify_signatures(blocks)
+
+        for block, block_signatures in zip(blocks, signatures):
+            Block.is_valid_block(last_block, block)
+            Blockchain.is_valid_block_transactions(ledger, block, transaction_ids, block_signatures)
+            ledger.apply_block(block)
+            last_block = block
+
+    def balance(self, address: str) -> int:
+        """
+        Return the balance of the address as of the tip of the chain.
+        The balances are indexed as blocks are added, so the lookup does not
+        walk the chain; the index is only rebuilt after the chain is replaced
+        by a fork.
+
+        Args:
+            address (str): The wallet address.
+
+        Returns:
+            int: The balance of the address.
+        """
+        with self.lock:
+            self.ledger.sync(self.chain)
+            return self.ledger.balance(address)
+
+    def find_block(self, hash: str) -> Optional[Tuple[int, Block]]:
+        """
+        Look a block of the chain up by its hash.
+
+        Args:
+            hash (str): The hash of the block.
+
+        Returns:
+            Optional[Tuple[int, Block]]: The height of the block and the Block,
+            None if the chain holds no such block.
+        """
+        with self.lock:
+            self.location_index.sync(self.chain)
+            height = self.location_index.block_heights.get(hash)
+
+            if height is None:
+                return None
+
+            return height, self.chain[height]
+
+    def find_transaction(self, transaction_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look a transaction recorded on the chain up by its id.
+
+        Args:
+            transaction_id (str): The id of the transaction.
+
+        Returns:
+            Optional[dict]: The transaction with the height and hash of its
+            block and its position in the block, None if it is not recorded.
+        """
+        with self.lock:
+            self.location_index.sync(self.chain)
+            location = self.location_index.transaction_locations.get(transaction_id)
+
+            if location is None:
+                return None
+
+            height, position = location
+            block = self.chain[height]
+
+            return {
+                "height": height,
+                "block_hash": block.hash,
+                "position": position,
+                "transaction": block.data[position],
+            }
+
+    def known_addresses(
+        self, prefix: str = "", cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[str], Optional[str]]:
+        """
+        Search the addresses that received an output on the chain.
+        The addresses are indexed as blocks are added, so the search costs
+        as much as the addresses it returns.
+
+        Args:
+            prefix (str): The start of the addresses to find.
+            cursor (str, optional): Only return addresses after this one.
+            limit (int): Maximum number of addresses to return.
+
+        Returns:
+            Tuple[List[str], Optional[str]]: The addresses in sorted order, and
+            the cursor of the next page, None once there are no more matches.
+        """
+        self.address_index.sync(self.chain)
+        return self.address_index.search(prefix, cursor, limit)
+
+    def transaction_history(
+        self, address: str, cursor: Optional[int] = None, limit: int = 100
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Return the transactions the address sent or received, newest first.
+        The transactions of every address are indexed as blocks are added,
+        so a page is found without walking the chain.
+
+        Args:
+            address (str): The wallet address.
+            cursor (int, optional): The cursor returned with the previous page.
+            limit (int): Maximum number of transactions to return.
+
+        Returns:
+            Tuple[List[dict], Optional[int]]: The transactions, each with the
+            height and hash of its block and its position in the block, and
+            the cursor of the next page, None once the oldest is reached.
+        """
+        with self.lock:
+            chain = self.chain
+            self.history_index.sync(chain)
+            locations, next_cursor = self.history_index.history(address, cursor, limit)
+            history = [
+                {
+                    "height": height,
+                    "block_hash": chain[height].hash,
+                    "position": position,
+                    "transaction": chain[height].data[position],
+                }
+                for height, position in locations
+            ]
+
+        return history, next_cursor
 
     def __repr__(self) -> str:
         """
@@ -39,21 +323,100 @@ class Blockchain:
           - The incoming chain is longer than the local one.
           - The incoming chain is formatted properly.
 
+        When the incoming chain contains the local tip at the same height, it
+        only extends the local chain: the local blocks are kept and only the
+        new blocks are validated. Any other chain is a fork and is validated
+        in full.
+
         Args:
             chain (List[Block]): The incoming Blockchain to replace the existing one.
 
         Raises:
             Exception: If the incoming chain is not longer or is invalid.
         """
-        if len(chain) <= len(self.chain):
-            raise Exception("Cannot replace. The incoming chain must be longer.")
+        with self.lock:
+            if len(chain) <= len(self.chain):
+                raise Exception("Cannot replace. The incoming chain must be longer.")
+
+            height = len(self.chain)
+
+            if chain[height - 1].hash == self.chain[-1].hash:
+                blocks = chain[height:]
+
+                try:
+                    self.is_valid_extension(blocks)
+                except Exception as e:
+                    raise Exception(f"Cannot replace. The incoming chain is invalid: {e}")
+
+                self.chain.extend(blocks)
+                self.notify_hooks(height)
+                return
+
+            try:
+                Blockchain.is_valid_chain(chain)
+            except Exception as e:
+                raise Exception(f"Cannot replace. The incoming chain is invalid: {e}")
+
+            while height and self.chain[height - 1].hash != chain[height - 1].hash:
+                height -= 1
+
+            self.chain = chain
+            self.notify_hooks(height)
+
+    def add_hook(self, hook: Callable[["Blockchain", int], None]) -> None:
+        """
+        Register a function to call after every change of the chain.
+        The hook receives the blockchain and the height of the first block
+        that was added or replaced.
+
+        Args:
+            hook (Callable[[Blockchain, int], None]): The function to register.
+        """
+        self.hooks.append(hook)
+
+    def notify_hooks(self, height: int) -> None:
+        """
+        Call the registered hooks after a change of the chain.
+
+        Args:
+            height (int): The height of the first block that was added or replaced.
+        """
+        for hook in self.hooks:
+            hook(self, height)
 
-        try:
-            Blockchain.is_valid_chain(chain)
-        except Exception as e:
-            raise Exception(f"Cannot replace. The incoming chain is invalid: {e}")
+    def range_from_tip(self, start: int, end: int) -> List[Block]:
+        """
+        Return the blocks from start to end, counted from the tip of the chain.
+        Same as self.chain[::-1][start:end], without reversing the whole chain.
+
+        Args:
+            start (int): Position of the first block, 0 being the tip.
+            end (int): Position after the last block.
 
-        self.chain = chain
+        Returns:
+            List[Block]: The blocks, newest first.
+        """
+        chain = self.chain
+        return [chain[i] for i in range(len(chain) - 1, -1, -1)[start:end]]
+
+    def page(self, cursor: int, limit: int) -> Tuple[List[Block], Optional[int]]:
+        """
+        Return up to limit blocks, starting at the height of the cursor.
+
+        Args:
+            cursor (int): Height of the first block of the page.
+            limit (int): Maximum number of blocks in the page.
+
+        Returns:
+            Tuple[List[Block], Optional[int]]: The blocks, oldest first, and the
+            cursor of the next page, None once the tip is reached.
+        """
+        chain = self.chain
+        cursor = max(cursor, 0)
+        blocks = chain[cursor : cursor + max(limit, 0)]
+        next_cursor = cursor + len(blocks)
+
+        return blocks, next_cursor if next_cursor < len(chain) else None
 
     def to_json(self) -> List[Dict[Any, Any]]:
         """
@@ -113,49 +476,119 @@ class Blockchain:
             - There can only be one mining reward per block.
             - Each transaction must be valid.
 
+        The chain is validated in two phases. The signatures, which do not
+        depend on each other, are first verified in parallel. Then a single
+        pass carries the balances of all addresses forward in a Ledger block
+        by block, checking the rules that depend on the order of transactions.
+
         Args:
             chain (List[Block]): The Blockchain to validate.
 
         Raises:
-            Exception: If there# My response was cut off. I'll complete it now.
-            are duplicate transactions, more than one mining reward per block,
-            or invalid transactions.
+            Exception: If there are duplicate transactions, more than one mining
+            reward per block, or invalid transactions.
         """
-        transaction_ids = set()
+        transaction_ids: Set[str] = set()
+        ledger = Ledger()
+        signatures = Blockchain.verify_signatures(chain)
 
-        for i in range(len(chain)):
-            block = chain[i]
-            has_mining_reward = False
+        for block, block_signatures in zip(chain, signatures):
+            Blockchain.is_valid_block_transactions(ledger, block, transaction_ids, block_signatures)
+            ledger.apply_block(block)
 
-            for transaction_json in block.data:
-                transaction = Transaction.from_json(transaction_json)
+    @staticmethod
+    def verify_signatures(blocks: List[Block]) -> List[Dict[int, bool]]:
+        """
+        Verify the signatures of the transactions of the blocks on a thread
+        pool. The cryptography library releases the GIL while verifying, so
+        the threads run on every core.
 
-                if transaction.id in transaction_ids:
-                    raise Exception(f"Transaction {transaction.id} is not unique")
+        Fewer than SIGNATURE_VERIFICATION_BATCH signatures are not worth the
+        pool and are left to be verified one by one during validation, as are
+        transactions too malformed to be verified.
 
-                transaction_ids.add(transaction.id)
+        Args:
+            blocks (List[Block]): The blocks whose signatures are verified.
 
-                if transaction.input == MINING_REWARD_INPUT:
-                    if has_mining_reward:
-                        raise Exception(
-                            "There can only be one mining reward per block. "
-                            f"Check block with hash: {block.hash}"
-                        )
+        Returns:
+            List[Dict[int, bool]]: For each block, whether the signature of
+            the transaction at each position is valid.
+        """
+        signatures: List[Dict[int, bool]] = [{} for _ in blocks]
+        signed = [
+            (block_signatures, position, transaction_json)
+            for block, block_signatures in zip(blocks, signatures)
+            if isinstance(block.data, list)
+            for position, transaction_json in enumerate(block.data)
+            if isinstance(transaction_json, dict)
+            and transaction_json.get("input") != MINING_REWARD_INPUT
+        ]
+
+        if len(signed) < SIGNATURE_VERIFICATION_BATCH:
+            return signatures
+
+        with ThreadPoolExecutor(SIGNATURE_VERIFICATION_THREADS) as executor:
+            results = executor.map(
+                Transaction.verify_signature,
+                [transaction_json for _, _, transaction_json in signed],
+            )
+
+            for (block_signatures, position, _), valid in zip(signed, results):
+                if valid is not None:
+                    block_signatures[position] = valid
+
+        return signatures
 
-                    has_mining_reward = True
-                else:
-                    historic_blockchain = Blockchain()
-                    historic_blockchain.chain = chain[0:i]
-                    historic_balance = Wallet.calculate_balance(
-                        historic_blockchain, transaction.input["address"]
+    @staticmethod
+    def is_valid_block_transactions(
+        ledger: Ledger,
+        block: Block,
+        transaction_ids: Union[Set[str], TransactionIds],
+        signatures: Optional[Dict[int, bool]] = None,
+    ) -> None:
+        """
+        Enforce the transaction rules for a single block, given the balances
+        and the ids of the transactions recorded by the blocks preceding it.
+        The ids of the block's transactions are added to transaction_ids.
+
+        Args:
+            ledger (Ledger): The balances as of the block preceding the block.
+            block (Block): The Block whose transactions are validated.
+            transaction_ids (Union[Set[str], TransactionIds]): Ids of the
+                transactions preceding the block.
+            signatures (Dict[int, bool], optional): Signatures already verified,
+                by position of the transaction in the block.
+
+        Raises:
+            Exception: If there are duplicate transactions, more than one mining
+            reward in the block, or invalid transactions.
+        """
+        has_mining_reward = False
+        signatures = signatures or {}
+
+        for position, transaction_json in enumerate(block.data):
+            transaction = Transaction.from_json(transaction_json)
+
+            if transaction.id in transaction_ids:
+                raise Exception(f"Transaction {transaction.id} is not unique")
+
+            transaction_ids.add(transaction.id)
+
+            if transaction.input == MINING_REWARD_INPUT:
+                if has_mining_reward:
+                    raise Exception(
+                        "There can only be one mining reward per block. "
+                        f"Check block with hash: {block.hash}"
                     )
 
-                    if historic_balance != transaction.input["amount"]:
-                        raise Exception(
-                            f"Transaction {transaction.id} has an invalid " "input amount"
-                        )
+                has_mining_reward = True
+            else:
+                historic_balance = ledger.balance(transaction.input["address"])
+
+                if historic_balance != transaction.input["amount"]:
+                    raise Exception(f"Transaction {transaction.id} has an invalid input amount")
 
-                Transaction.is_valid_transaction(transaction)
+            Transaction.is_valid_transaction(transaction, signatures.get(position))
 
 
 def main() -> None:
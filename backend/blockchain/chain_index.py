@@ -0,0 +1,62 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional
+
+
+class ChainIndex(ABC):
+    """
+    Base class of the lookup indexes kept over the blocks of a chain.
+    The index follows the chain incrementally: blocks appended since the last
+    sync are applied one by one, and the index is only rebuilt from scratch
+    when the block it was last synced to is no longer on the chain (a reorg).
+    """
+
+    def __init__(self) -> None:
+        self.height = 0
+        self.tip_hash: Optional[str] = None
+        self.lock = threading.Lock()
+        self.reset()
+
+    @abstractmethod
+    def reset(self) -> None:
+        """
+        Clear the indexed state.
+        """
+
+    @abstractmethod
+    def apply_block(self, block: Any) -> None:
+        """
+        Add a block to the indexed state.
+        The block is applied at self.height, which is its position in the chain.
+
+        Args:
+            block (Block): The next Block of the chain.
+        """
+
+    def finish_sync(self) -> None:
+        """
+        Complete the indexed state once the new blocks of a sync are applied.
+        Does nothing unless a subclass defers work to the end of a sync.
+        """
+
+    def sync(self, chain: List[Any]) -> None:
+        """
+        Bring the index up to date with the chain.
+
+        Args:
+            chain (List[Block]): The chain to index.
+        """
+        with self.lock:
+            if self.height > len(chain) or (
+                self.height and chain[self.height - 1].hash != self.tip_hash
+            ):
+                self.height = 0
+                self.tip_hash = None
+                self.reset()
+
+            for block in chain[self.height :]:
+                self.apply_block(block)
+                self.height += 1
+                self.tip_hash = block.hash
+
+            self.finish_sync()
@@ -0,0 +1,373 @@
+"""
+Compact binary encoding of blocks, used for persistence and peer sync.
+
+Values are encoded with a one byte tag followed by their payload. Every JSON
+value round-trips exactly, keeping the order of object keys, which the block
+hash depends on. On top of the plain JSON types, the values found in
+transactions get compact forms:
+  - hex strings such as hashes are stored as raw bytes
+  - PEM public keys are stored as 33 byte compressed points
+  - (r, s) signatures are stored as two 32 byte integers
+  - the field names of transactions are stored as a one byte index
+A compact form is only used when decoding it gives back the exact value.
+"""
+
+import struct
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from backend.blockchain.block import Block
+from backend.config import MINING_REWARD_INPUT
+
+MEDIA_TYPE = "application/octet-stream"
+BLOCK_FORMAT_VERSION = 1
+
+NONE = 0
+FALSE = 1
+TRUE = 2
+INT = 3
+FLOAT = 4
+STR = 5
+HEX = 6
+LIST = 7
+DICT = 8
+NAME = 9
+PUBLIC_KEY = 10
+SIGNATURE = 11
+
+FLOAT_VALUE = struct.Struct(">d")
+SIGNATURE_VALUE = struct.Struct(">32s32s")
+COMPRESSED_KEY_SIZE = 33
+MIN_HEX_LENGTH = 16
+
+# Strings repeated in every transaction, encoded as a one byte index.
+NAMES = [
+    "id",
+    "output",
+    "input",
+    "timestamp",
+    "amount",
+    "address",
+    "public_key",
+    "signature",
+    MINING_REWARD_INPUT["address"],
+]
+NAME_INDEXES = {name: index for index, name in enumerate(NAMES)}
+
+
+def encode_blocks(blocks: List[Block]) -> bytes:
+    """
+    Encode a list of blocks.
+
+    Args:
+        blocks (List[Block]): The Blocks to encode.
+
+    Returns:
+        bytes: The encoded blocks.
+    """
+    out = bytearray()
+    write_varint(out, len(blocks))
+
+    for block in blocks:
+        write_block(out, block)
+
+    return bytes(out)
+
+
+def decode_blocks(data: bytes, offset: int = 0) -> Tuple[List[Block], int]:
+    """
+    Decode a list of blocks encoded by encode_blocks.
+
+    Args:
+        data (bytes): The encoded data.
+        offset (int): Where the encoded blocks start.
+
+    Returns:
+        Tuple[List[Block], int]: The Blocks and the offset after them.
+    """
+    count, offset = read_varint(data, offset)
+    blocks = []
+
+    for _ in range(count):
+        block, offset = read_block(data, offset)
+        blocks.append(block)
+
+    return blocks, offset
+
+
+def encode_block(block: Block) -> bytes:
+    """
+    Encode a block.
+
+    Args:
+        block (Block): The Block to encode.
+
+    Returns:
+        bytes: The encoded Block.
+    """
+    out = bytearray()
+    write_block(out, block)
+
+    return bytes(out)
+
+
+def decode_block(data: bytes) -> Block:
+    """
+    Decode a block encoded by encode_block.
+
+    Args:
+        data (bytes): The encoded Block.
+
+    Returns:
+        Block: The decoded Block.
+    """
+    block, _ = read_block(data, 0)
+
+    return block
+
+
+def write_block(out: bytearray, block: Block) -> None:
+    out.append(BLOCK_FORMAT_VERSION)
+
+    for field in Block.FIELDS:
+        write_value(out, getattr(block, field))
+
+
+def read_block(data: bytes, offset: int) -> Tuple[Block, int]:
+    if data[offset] != BLOCK_FORMAT_VERSION:
+        raise Exception(f"Unknown block format version {data[offset]}")
+
+    offset += 1
+    fields = []
+
+    for _ in Block.FIELDS:
+        value, offset = read_value(data, offset)
+        fields.append(value)
+
+    return Block(*fields), offset
+
+
+def write_value(out: bytearray, value: Any, key: Any = None) -> None:
+    """
+    Append the encoding of a value to out.
+
+    Args:
+        out (bytearray): The buffer to write to.
+        value (Any): A JSON value.
+        key (Any): The key of the value in its enclosing object, if any.
+
+    Raises:
+        Exception: If the value cannot be represented in JSON.
+    """
+    if value is None:
+        out.append(NONE)
+    elif value is False:
+        out.append(FALSE)
+    elif value is True:
+        out.append(TRUE)
+    elif isinstance(value, int):
+        out.append(INT)
+        write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+    elif isinstance(value, float):
+        out.append(FLOAT)
+        out += FLOAT_VALUE.pack(value)
+    elif isinstance(value, str):
+        write_str(out, value, key)
+    elif isinstance(value, (list, tuple)):
+        if key == "signature" and is_signature(value):
+            out.append(SIGNATURE)
+            out += SIGNATURE_VALUE.pack(value[0].to_bytes(32, "big"), value[1].to_bytes(32, "big"))
+            return
+
+        out.append(LIST)
+        write_varint(out, len(value))
+
+        for item in value:
+            write_value(out, item)
+    elif isinstance(value, dict):
+        out.append(DICT)
+        write_varint(out, len(value))
+
+        for item_key, item in value.items():
+            write_value(out, item_key)
+            write_value(out, item, item_key)
+    else:
+        raise Exception(f"Cannot encode a value of type {type(value).__name__}")
+
+
+def write_str(out: bytearray, value: str, key: Any) -> None:
+    if value in NAME_INDEXES:
+        out.append(NAME)
+        out.append(NAME_INDEXES[value])
+        return
+
+    if key == "public_key":
+        compressed_key = compress_public_key(value)
+
+        if compressed_key is not None:
+            out.append(PUBLIC_KEY)
+            out += compressed_key
+            return
+
+    raw = hex_bytes(value)
+
+    if raw is not None:
+        out.append(HEX)
+        write_varint(out, len(raw))
+        out += raw
+        return
+
+    encoded = value.encode("utf-8")
+    out.append(STR)
+    write_varint(out, len(encoded))
+    out += encoded
+
+
+def read_value(data: bytes, offset: int) -> Tuple[Any, int]:
+    """
+    Decode the value encoded at the offset.
+
+    Args:
+        data (bytes): The encoded data.
+        offset (int): Where the value starts.
+
+    Returns:
+        Tuple[Any, int]: The value and the offset after it.
+    """
+    tag = data[offset]
+    offset += 1
+
+    # Ordered by how often the tags occur in blocks of transactions.
+    if tag == NAME:
+        return NAMES[data[offset]], offset + 1
+    if tag == INT:
+        zigzag, offset = read_varint(data, offset)
+        return zigzag // 2 if zigzag % 2 == 0 else -(zigzag + 1) // 2, offset
+    if tag == DICT:
+        count, offset = read_varint(data, offset)
+        value: Dict[Any, Any] = {}
+
+        for _ in range(count):
+            item_key, offset = read_value(data, offset)
+            value[item_key], offset = read_value(data, offset)
+
+        return value, offset
+    if tag == HEX or tag == STR:
+        length, offset = read_varint(data, offset)
+        raw = data[offset : offset + length]
+        return raw.hex() if tag == HEX else raw.decode("utf-8"), offset + length
+    if tag == SIGNATURE:
+        r, s = SIGNATURE_VALUE.unpack_from(data, offset)
+        return [int.from_bytes(r, "big"), int.from_bytes(s, "big")], offset + SIGNATURE_VALUE.size
+    if tag == PUBLIC_KEY:
+        compressed_key = bytes(data[offset : offset + COMPRESSED_KEY_SIZE])
+        return decompress_public_key(compressed_key), offset + COMPRESSED_KEY_SIZE
+    if tag == LIST:
+        count, offset = read_varint(data, offset)
+        items = []
+
+        for _ in range(count):
+            item, offset = read_value(data, offset)
+            items.append(item)
+
+        return items, offset
+    if tag == NONE:
+        return None, offset
+    if tag == FALSE:
+        return False, offset
+    if tag == TRUE:
+        return True, offset
+    if tag == FLOAT:
+        return FLOAT_VALUE.unpack_from(data, offset)[0], offset + FLOAT_VALUE.size
+
+    raise Exception(f"Unknown value tag {tag}")
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+
+    out.append(value)
+
+
+def read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    byte = data[offset]
+
+    if byte < 0x80:
+        return byte, offset + 1
+
+    value = 0
+    shift = 0
+
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+
+        if byte < 0x80:
+            return value, offset
+
+
+def is_signature(value: Any) -> bool:
+    return len(value) == 2 and all(
+        isinstance(part, int) and not isinstance(part, bool) and 0 <= part < 1 << 256
+        for part in value
+    )
+
+
+def hex_bytes(value: str) -> Optional[bytes]:
+    """
+    Return the bytes of a lowercase hex string, None for any other string.
+    """
+    if len(value) < MIN_HEX_LENGTH or len(value) % 2:
+        return None
+
+    try:
+        raw = bytes.fromhex(value)
+    except ValueError:
+        return None
+
+    return raw if raw.hex() == value else None
+
+
+@lru_cache(maxsize=4096)
+def compress_public_key(public_key: str) -> Optional[bytes]:
+    """
+    Return the compressed point of a PEM public key, None if the key cannot
+    be restored exactly from it.
+    """
+    try:
+        key = serialization.load_pem_public_key(public_key.encode("utf-8"))
+        compressed_key = key.public_bytes(
+            serialization.Encoding.X962, serialization.PublicFormat.CompressedPoint
+        )
+    except Exception:
+        return None
+
+    if len(compressed_key) != COMPRESSED_KEY_SIZE:
+        return None
+
+    try:
+        if decompress_public_key(compressed_key) != public_key:
+            return None
+    except Exception:
+        return None
+
+    return compressed_key
+
+
+@lru_cache(maxsize=4096)
+def decompress_public_key(compressed_key: bytes) -> str:
+    """
+    Return the PEM public key of a compressed secp256k1 point.
+    """
+    key = ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256K1(), compressed_key)
+
+    return key.public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode("utf-8")
@@ -0,0 +1,59 @@
+from typing import Any, Dict, Mapping, Set, Tuple
+
+from backend.blockchain.chain_index import ChainIndex
+
+
+class LocationIndex(ChainIndex):
+    """
+    The height of every block of a chain by its hash, and the location of
+    every transaction by its id, as (block height, position in the block).
+    """
+
+    def reset(self) -> None:
+        self.block_heights: Dict[str, int] = {}
+        self.transaction_locations: Dict[str, Tuple[int, int]] = {}
+
+    def apply_block(self, block: Any) -> None:
+        """
+        Record the block and its transactions.
+
+        Args:
+            block (Block): The Block to index, at height self.height.
+        """
+        self.block_heights[block.hash] = self.height
+
+        if not isinstance(block.data, list):
+            return
+
+        for position, transaction_json in enumerate(block.data):
+            if isinstance(transaction_json, dict) and "id" in transaction_json:
+                self.transaction_locations.setdefault(
+                    transaction_json["id"], (self.height, position)
+                )
+
+    def transaction_ids(self) -> "TransactionIds":
+        """
+        Return the ids of the indexed transactions, as a set that ids can be
+        added to without changing the index.
+
+        Returns:
+            TransactionIds: The ids of the indexed transactions.
+        """
+        return TransactionIds(self.transaction_locations)
+
+
+class TransactionIds:
+    """
+    The ids of the transactions recorded on a chain, plus the ids of
+    candidate transactions added on top of them.
+    """
+
+    def __init__(self, recorded: Mapping[str, Any]) -> None:
+        self.recorded = recorded
+        self.added: Set[str] = set()
+
+    def __contains__(self, transaction_id: object) -> bool:
+        return transaction_id in self.added or transaction_id in self.recorded
+
+    def add(self, transaction_id: str) -> None:
+        self.added.add(transaction_id)
@@ -0,0 +1,163 @@
+import multiprocessing
+import pickle
+import queue
+import time
+from typing import Any, Callable, Optional
+
+from backend.blockchain.block import Block
+from backend.config import MINING_PROCESSES
+
+# Seconds between two checks of should_stop while the worker processes mine.
+STOP_POLL_INTERVAL = 0.05
+# Seconds to wait for the remaining workers to report once mining is over.
+DRAIN_TIMEOUT = 5
+
+
+class ParallelMiner:
+    """
+    Mines blocks on several processes.
+    The nonce space is split between the workers: worker i tries the nonces
+    i, i + processes, i + 2 * processes, ... so no nonce is tried twice, and
+    every worker stops as soon as one of them has found a valid block.
+    """
+
+    def __init__(self, processes: int = MINING_PROCESSES) -> None:
+        """
+        Initialize a ParallelMiner instance.
+
+        Args:
+            processes (int): Number of worker processes, 1 mines in the calling process.
+        """
+        self.processes = processes
+
+    def mine_block(self, last_block: Block, data: Any) -> Block:
+        """
+        Mine a block based on the given last_block and data.
+
+        Args:
+            last_block (Block): The last Block in the Blockchain.
+            data (List[Any]): Data to be included in the Block.
+
+        Returns:
+            Block: The newly mined Block, the same as Block.mine_block would return.
+        """
+        block = self.search(last_block, data)
+
+        if block is None:
+            raise Exception("Mining stopped before a block was found")
+
+        return block
+
+    def search(
+        self,
+        last_block: Block,
+        data: Any,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> Optional[Block]:
+        """
+        Mine a block based on the given last_block and data, unless stopped.
+
+        Args:
+            last_block (Block): The last Block in the Blockchain.
+            data (List[Any]): Data to be included in the Block.
+            should_stop (Callable[[], bool]): Polled while mining; mining is
+                abandoned once it returns True.
+
+        Returns:
+            Optional[Block]: The newly mined Block, or None if mining was stopped.
+
+        Raises:
+            Exception: The exception raised by a worker process, or an exception
+                if a worker process exited without reporting.
+        """
+        if self.processes <= 1:
+            return Block.search_nonce(last_block, data, should_stop=should_stop)
+
+        stop = multiprocessing.Event()
+        results: Any = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(
+                target=search_nonce_worker,
+                args=(last_block, data, nonce, self.processes, stop, results),
+                daemon=True,
+            )
+            for nonce in range(self.processes)
+        ]
+
+        for worker in workers:
+            worker.start()
+
+        block = None
+        error: Optional[BaseException] = None
+        received = 0
+
+        while block is None and error is None and received < len(workers):
+            try:
+                result = results.get(timeout=STOP_POLL_INTERVAL)
+            except queue.Empty:
+                if should_stop and should_stop():
+                    break
+
+                if any(worker.exitcode not in (None, 0) for worker in workers):
+                    error = Exception("A mining process exited without reporting")
+
+                continue
+
+            received += 1
+
+            if isinstance(result, BaseException):
+                error = result
+            else:
+                block = result
+
+        stop.set()
+
+        # Every live worker reports exactly once, drain the queue so they can exit.
+        deadline = time.monotonic() + DRAIN_TIMEOUT
+
+        while received < len(workers) and time.monotonic() < deadline:
+            try:
+                results.get(timeout=STOP_POLL_INTERVAL)
+                received += 1
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    break
+
+        for worker in workers:
+            worker.join(timeout=STOP_POLL_INTERVAL)
+
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+
+        if error is not None:
+            raise error
+
+        return block
+
+
+def search_nonce_worker(
+    last_block: Block, data: Any, nonce: int, nonce_step: int, stop: Any, results: Any
+) -> None:
+    """
+    Search one slice of the nonce space and report the outcome to the results queue.
+
+    Args:
+        last_block (Block): The last Block in the Blockchain.
+        data (List[Any]): Data to be included in the Block.
+        nonce (int): The first nonce of the slice.
+        nonce_step (int): The distance between two nonces of the slice.
+        stop (multiprocessing.Event): Set once any worker has found a block.
+        results (multiprocessing.Queue): Receives the mined Block, None, or the
+            exception raised while mining.
+    """
+    try:
+        result = Block.search_nonce(last_block, data, nonce, nonce_step, stop.is_set)
+    except Exception as e:
+        try:
+            pickle.dumps(e)
+            result = e
+        except Exception:
+            result = Exception(f"{type(e).__name__}: {e}")
+
+    results.put(result)
@@ -1,3 +1,5 @@
+import os
+
 NANOSECONDS = 1
 MICROSECONDS = 1000 * NANOSECONDS
 MILLISECONDS = 1000 * MICROSECONDS
@@ -9,3 +11,28 @@ STARTING_BALANCE = 1000
 
 MINING_REWARD = 50
 MINING_REWARD_INPUT = {"address": "*--official-mining-reward--*"}
+
+MINING_PROCESSES = 1
+MINING_JOB_HISTORY = 100
+MINING_FAILURE_BACKOFF_SECONDS = 1
+BLOCKCHAIN_PAGE_LIMIT = 100
+KNOWN_ADDRESSES_PAGE_LIMIT = 100
+HISTORY_PAGE_LIMIT = 100
+PUBLIC_KEY_CACHE_SIZE = 4096
+SIGNATURE_VERIFICATION_THREADS = os.cpu_count() or 1
+SIGNATURE_VERIFICATION_BATCH = 32
+
+POOL_MAX_TRANSACTIONS = 5000
+POOL_MAX_BYTES = 5 * 1024 * 1024
+BLOCK_MAX_TRANSACTIONS = 1000
+RECENT_TRANSACTIONS = 10000
+
+LOCATOR_DENSE_HASHES = 10
+SYNC_BATCH_SIZE = 500
+PUBLISH_BATCH_SIZE = 20
+LOCAL_BROKER_PORT = 4999
+
+EVENT_QUEUE_SIZE = 1000
+EVENT_HEARTBEAT_SECONDS = 15
+
+RESPONSE_CACHE_SIZE = 256
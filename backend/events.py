@@ -0,0 +1,106 @@
+import json
+import queue
+import threading
+
+from backend.config import EVENT_HEARTBEAT_SECONDS, EVENT_QUEUE_SIZE
+
+
+class EventStream:
+    """
+    Pushes the changes of the chain and of the transaction pool to the
+    connected clients as server-sent events, so they only receive deltas:
+      - blocks: the height of the first added or replaced block and the
+        blocks from that height on
+      - transaction: a transaction set in the pool
+      - transactions-cleared: the ids of the transactions deleted from the pool
+
+    Every event is formatted once and queued for each client. A client that
+    falls EVENT_QUEUE_SIZE events behind is disconnected; it can reconnect
+    and load the current state again.
+    """
+
+    def __init__(self, max_queued=EVENT_QUEUE_SIZE):
+        self.max_queued = max_queued
+        self.subscribers = set()
+        self.lock = threading.Lock()
+
+    def watch_blockchain(self, blockchain):
+        blockchain.add_hook(self.publish_blocks)
+
+    def watch_transaction_pool(self, transaction_pool):
+        transaction_pool.add_hook(self.publish_pool_change)
+
+    def publish_blocks(self, blockchain, height):
+        blocks = ",".join(block.serialize() for block in blockchain.chain[height:])
+        self.publish("blocks", f'{{"height": {height}, "blocks": [{blocks}]}}')
+
+    def publish_pool_change(self, event, data):
+        if event == "transaction":
+            self.publish(event, data.serialize())
+        else:
+            self.publish(event, json.dumps(data))
+
+    def publish(self, event, data):
+        """
+        Queue an event for every client. The data is a JSON string.
+        """
+        frame = f"event: {event}\ndata: {data}\n\n"
+
+        with self.lock:
+            for subscriber in list(self.subscribers):
+                try:
+                    subscriber.put_nowait(frame)
+                except queue.Full:
+                    self.subscribers.discard(subscriber)
+                    self.close(subscriber)
+
+    def subscribe(self):
+        """
+        Register a client and return the queue of its events.
+        """
+        subscriber = queue.Queue(self.max_queued)
+
+        with self.lock:
+            self.subscribers.add(subscriber)
+
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def stream(self, subscriber, heartbeat=EVENT_HEARTBEAT_SECONDS):
+        """
+        Yield the events of a client as they are published, with a comment
+        line every heartbeat seconds without events to keep the connection open.
+        A first comment line is sent right away, so the response starts at once.
+        """
+        try:
+            yield ": connected\n\n"
+
+            while True:
+                try:
+                    frame = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": heartbeat\n\n"
+                    continue
+
+                if frame is None:
+                    return
+
+                yield frame
+        finally:
+            self.unsubscribe(subscriber)
+
+    @staticmethod
+    def close(subscriber):
+        """
+        Drop the queued events of a client and end its stream.
+        """
+        while True:
+            try:
+                subscriber.get_nowait()
+            except queue.Empty:
+                break
+
+        subscriber.put_nowait(None)
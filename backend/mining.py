@@ -0,0 +1,269 @@
+import copy
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from backend.config import (
+    BLOCK_MAX_TRANSACTIONS,
+    MINING_FAILURE_BACKOFF_SECONDS,
+    MINING_JOB_HISTORY,
+)
+from backend.wallet.transaction import Transaction
+
+
+class MiningJob:
+    """
+    A request to mine one block, tracked from the moment it is queued until
+    its block is added to the chain or the attempt fails.
+    """
+
+    def __init__(self):
+        self.id = str(uuid.uuid4())[0:8]
+        self.status = "queued"
+        self.block = None
+        self.error = None
+        self.finished = threading.Event()
+
+    def finish(self, status, block=None, error=None):
+        """
+        Record the outcome of the job and wake up anyone waiting for it.
+        """
+        self.status = status
+        self.block = block
+        self.error = error
+        self.finished.set()
+
+    def wait(self, timeout=None):
+        """
+        Block until the job is finished, return whether it did finish.
+        """
+        return self.finished.wait(timeout)
+
+    def to_json(self):
+        """
+        Serialize the job.
+        """
+        return {
+            "id": self.id,
+            "status": self.status,
+            "block": self.block.to_json() if self.block else None,
+            "error": self.error,
+        }
+
+
+class MiningService:
+    """
+    Mines blocks on a background thread, so that mining never holds up the
+    API. Blocks are mined for queued jobs and, while the service is started,
+    continuously from templates assembled out of the transaction pool.
+
+    Mining is interrupted when a competing block becomes the new tip; the
+    block in progress is then restarted on the new tip, and the abandoned
+    work is counted in the metrics.
+    """
+
+    def __init__(self, blockchain, transaction_pool, wallet, pubsub):
+        self.blockchain = blockchain
+        self.transaction_pool = transaction_pool
+        self.wallet = wallet
+        self.pubsub = pubsub
+        self.running = False
+        self.current_job = None
+        self.blocks_mined = 0
+        self.mining_restarts = 0
+        self.abandoned_mining_seconds = 0.0
+        self.interrupted = threading.Event()
+        self.jobs = OrderedDict()
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def submit(self):
+        """
+        Queue a job to mine one block and return it.
+        """
+        job = self.create_job()
+        self.ensure_thread()
+        self.queue.put(job)
+
+        return job
+
+    def start(self):
+        """
+        Mine blocks continuously until stopped.
+        """
+        self.running = True
+        self.ensure_thread()
+        self.queue.put(None)
+
+    def stop(self):
+        """
+        Stop mining continuously once the block in progress is done.
+        Jobs that were already queued are still mined.
+        """
+        self.running = False
+
+    def status(self):
+        """
+        Describe the state of the service.
+        """
+        return {
+            "running": self.running,
+            "current_job": self.current_job.id if self.current_job else None,
+            "queued_jobs": self.queue.qsize(),
+            "blocks_mined": self.blocks_mined,
+            "mining_restarts": self.mining_restarts,
+            "abandoned_mining_seconds": self.abandoned_mining_seconds,
+        }
+
+    def interrupt(self):
+        """
+        Signal that the tip of the chain has changed, so the block in progress
+        is stale and must be restarted on the new tip.
+        """
+        self.interrupted.set()
+
+    def get_job(self, job_id):
+        """
+        Find a recent job by its id.
+        """
+        return self.jobs.get(job_id)
+
+    def create_job(self):
+        """
+        Create a job and remember it, forgetting the oldest jobs beyond
+        MINING_JOB_HISTORY.
+        """
+        job = MiningJob()
+
+        with self.lock:
+            self.jobs[job.id] = job
+
+            while len(self.jobs) > MINING_JOB_HISTORY:
+                self.jobs.popitem(last=False)
+
+        return job
+
+    def ensure_thread(self):
+        """
+        Start the mining thread if it is not running yet.
+        """
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def run(self):
+        """
+        Mine queued jobs, or new ones while running, one block at a time.
+        After a failed job, wait MINING_FAILURE_BACKOFF_SECONDS before the
+        next one, so a persistent failure does not spin.
+        """
+        while True:
+            try:
+                job = self.queue.get(block=not self.running)
+            except queue.Empty:
+                job = None
+
+            if job is None:
+                if not self.running:
+                    continue
+
+                job = self.create_job()
+
+            self.mine(job)
+
+            if job.status == "failed":
+                time.sleep(MINING_FAILURE_BACKOFF_SECONDS)
+
+    def block_template(self):
+        """
+        Assemble the data of the next block: the oldest pooled transactions,
+        up to BLOCK_MAX_TRANSACTIONS of them, and the reward of this node's
+        wallet. The data is copied, so transactions updated in the pool while
+        mining do not alter the block.
+
+        The transactions are checked against the balances as of the tip, in
+        order. Those that are no longer valid, such as a transaction whose
+        sender received funds since it was made, are left out of the block
+        and removed from the pool, so they cannot fail every block mined.
+        """
+        with self.blockchain.lock:
+            self.blockchain.ledger.sync(self.blockchain.chain)
+            ledger = self.blockchain.ledger.copy()
+            self.blockchain.location_index.sync(self.blockchain.chain)
+            transaction_ids = self.blockchain.location_index.transaction_ids()
+
+        transaction_data = []
+        invalid_ids = []
+
+        for transaction_json in copy.deepcopy(
+            self.transaction_pool.transaction_data(BLOCK_MAX_TRANSACTIONS)
+        ):
+            try:
+                transaction = Transaction.from_json(transaction_json)
+
+                if transaction.id in transaction_ids:
+                    raise Exception(f"Transaction {transaction.id} is not unique")
+
+                if ledger.balance(transaction.input["address"]) != transaction.input["amount"]:
+                    raise Exception(f"Transaction {transaction.id} has an invalid input amount")
+
+                Transaction.is_valid_transaction(transaction)
+            except Exception:
+                invalid_ids.append(transaction_json.get("id"))
+                continue
+
+            transaction_ids.add(transaction.id)
+            ledger.apply_transaction(transaction_json)
+            transaction_data.append(transaction_json)
+
+        self.transaction_pool.remove_transactions(invalid_ids)
+        transaction_data.append(Transaction.reward_transaction(self.wallet).to_json())
+
+        return transaction_data
+
+    def mine(self, job):
+        """
+        Mine a block for the job on top of the current tip, then add it to
+        the chain, broadcast it and clear its transactions from the pool.
+        """
+        self.current_job = job
+        job.status = "mining"
+
+        try:
+            block = self.mine_on_tip()
+            self.pubsub.broadcast_block(block)
+            self.transaction_pool.clear_block_transactions([block])
+            self.blocks_mined += 1
+            job.finish("mined", block=block)
+        except Exception as e:
+            job.finish("failed", error=str(e))
+        finally:
+            self.current_job = None
+
+    def mine_on_tip(self):
+        """
+        Mine a block on the current tip and add it to the chain, starting over
+        on the new tip with the remaining pooled transactions whenever the tip
+        changes before the block is added. The tip is checked and the block
+        added under the chain lock, so no other block can slip in between.
+        """
+        while True:
+            self.interrupted.clear()
+            last_block = self.blockchain.chain[-1]
+            start_time = time.time()
+            block = self.blockchain.miner.search(
+                last_block, self.block_template(), self.interrupted.is_set
+            )
+
+            if block is not None:
+                with self.blockchain.lock:
+                    if self.blockchain.chain[-1] is last_block:
+                        self.blockchain.append_block(block)
+                        return block
+
+            self.mining_restarts += 1
+            self.abandoned_mining_seconds += time.time() - start_time
@@ -1,66 +1,145 @@
-import os
+import json
+import queue
+import threading
 import time
-
-from dotenv import load_dotenv
-from pubnub.callbacks import SubscribeCallback
-from pubnub.pnconfiguration import PNConfiguration
-from pubnub.pubnub import PubNub
+import uuid
 
 from backend.blockchain.block import Block
+from backend.config import PUBLISH_BATCH_SIZE
+from backend.transport import create_transport
 from backend.wallet.transaction import Transaction
 
-load_dotenv()
-
-pnconfig = PNConfiguration()
-pnconfig.subscribe_key = os.environ.get("subscribe_key")
-pnconfig.publish_key = os.environ.get("publish_key")
-
 CHANNELS = {"TEST": "TEST", "BLOCK": "BLOCK", "TRANSACTION": "TRANSACTION"}
 
 
-class Listener(SubscribeCallback):
-    def __init__(self, blockchain, transaction_pool):
+class Listener:
+    def __init__(self, blockchain, transaction_pool, mining_service=None, origin=None):
         self.blockchain = blockchain
         self.transaction_pool = transaction_pool
+        self.mining_service = mining_service
+        self.origin = origin
 
     def message(self, pubnub, message_object):
+        if self.origin and getattr(message_object, "publisher", None) == self.origin:
+            return
+
         print(f"\n-- Channel: {message_object.channel} | Message: {message_object.message}")
 
         if message_object.channel == CHANNELS["BLOCK"]:
-            block = Block.from_json(message_object.message)
-            potential_chain = self.blockchain.chain[:]
-            potential_chain.append(block)
-
             try:
-                self.blockchain.replace_chain(potential_chain)
-                self.transaction_pool.clear_blockchain_transactions(self.blockchain)
-                print("\n -- Successfully replaced the local chain")
+                block = Block.from_json(message_object.message)
+                self.blockchain.append_block(block)
+                self.transaction_pool.clear_block_transactions([block])
+                print("\n -- Successfully appended the block to the local chain")
+
+                if self.mining_service:
+                    self.mining_service.interrupt()
             except Exception as e:
-                print(f"\n -- Did not replace chain: {e}")
+                print(f"\n -- Did not append the block: {e}")
         elif message_object.channel == CHANNELS["TRANSACTION"]:
-            transaction = Transaction.from_json(message_object.message)
-            self.transaction_pool.set_transaction(transaction)
+            transactions_json = message_object.message
+
+            if not isinstance(transactions_json, list):
+                transactions_json = [transactions_json]
+
+            for transaction_json in transactions_json:
+                self.admit_transaction(transaction_json)
+
+    def admit_transaction(self, transaction_json):
+        try:
+            transaction = Transaction.from_json(transaction_json)
+            self.transaction_pool.admit_transaction(transaction, self.blockchain)
             print("\n -- Set the new transaction in the transaction pool")
+        except Exception as e:
+            print(f"\n -- Did not set the transaction: {e}")
+
+
+def batch_messages(batch):
+    """
+    Group queued (channel, message) pairs for publishing, keeping their order.
+    Consecutive transactions are merged into one message holding their list.
+    """
+    messages = []
+
+    for channel, message in batch:
+        if channel == CHANNELS["TRANSACTION"] and messages and messages[-1][0] == channel:
+            messages[-1][1].append(message)
+        elif channel == CHANNELS["TRANSACTION"]:
+            messages.append((channel, [message]))
+        else:
+            messages.append((channel, message))
+
+    return [
+        (
+            channel,
+            message[0] if channel == CHANNELS["TRANSACTION"] and len(message) == 1 else message,
+        )
+        for channel, message in messages
+    ]
 
 
 class PubSub:
     """
     Handles the publish/subscribe layer of the application.
     Provides communication between the nodes of the blockchain network.
+
+    Messages are published from a background thread, so broadcasting never
+    waits on the network. The node stays subscribed to every channel and
+    recognizes its own messages by its origin id.
+
+    Messages travel through a transport: PubNub by default, or a local
+    broker (see backend/transport.py).
     """
 
-    def __init__(self, blockchain, transaction_pool):
-        self.pubnub = PubNub(pnconfig)
-        self.pubnub.subscribe().channels(CHANNELS.values()).execute()
-        self.pubnub.add_listener(Listener(blockchain, transaction_pool))
+    def __init__(self, blockchain, transaction_pool, transport=None, origin=None):
+        self.origin = origin or str(uuid.uuid4())
+        self.transport = transport or create_transport(self.origin)
+        self.listener = Listener(blockchain, transaction_pool, origin=self.origin)
+        self.transport.subscribe(CHANNELS.values(), self.listener)
+        self.outbound = queue.Queue()
+        self.publisher = threading.Thread(target=self.run_publisher, daemon=True)
+        self.publisher.start()
 
     def publish(self, channel, message):
+        """
+        Queue the message object to be published to the channel.
+        """
+        self.outbound.put((channel, message))
+
+    def flush(self):
+        """
+        Wait until every queued message is published.
+        """
+        self.outbound.join()
+
+    def run_publisher(self):
+        """
+        Publish the queued messages, in order, taking up to
+        PUBLISH_BATCH_SIZE of them at a time.
+        """
+        while True:
+            batch = [self.outbound.get()]
+
+            while len(batch) < PUBLISH_BATCH_SIZE:
+                try:
+                    batch.append(self.outbound.get_nowait())
+                except queue.Empty:
+                    break
+
+            for channel, message in batch_messages(batch):
+                try:
+                    self.send(channel, message)
+                except Exception as e:
+                    print(f"\n -- Did not publish to {channel}: {e}")
+
+            for _ in batch:
+                self.outbound.task_done()
+
+    def send(self, channel, message):
         """
         Publish the message object to the channel.
         """
-        self.pubnub.unsubscribe().channels([channel]).execute()
-        self.pubnub.publish().channel(channel).message(message).sync()
-        self.pubnub.subscribe().channels([channel]).execute()
+        self.transport.publish(channel, message)
 
     def broadcast_block(self, block):
         """
@@ -72,15 +151,16 @@ class PubSub:
         """
         Broadcast a transaction to all nodes.
         """
-        self.publish(CHANNELS["TRANSACTION"], transaction.to_json())
+        self.publish(CHANNELS["TRANSACTION"], json.loads(transaction.serialize()))
 
 
 def main():
-    pubsub = PubSub()
+    pubsub = PubSub(None, None)
 
     time.sleep(1)
 
     pubsub.publish(CHANNELS["TEST"], {"foo": "bar"})
+    pubsub.flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+import tracemalloc
+
+from backend.blockchain.block import Block
+from backend.wallet.transaction import Transaction
+
+BLOCKS = 100000
+
+
+class DictBlock:
+    """
+    A block holding its fields in a __dict__, as blocks used to.
+    """
+
+    def __init__(self, timestamp, last_hash, hash, data, difficulty, nonce):
+        self.timestamp = timestamp
+        self.last_hash = last_hash
+        self.hash = hash
+        self.data = data
+        self.difficulty = difficulty
+        self.nonce = nonce
+
+
+def measure(create):
+    tracemalloc.start()
+    objects = [create(i) for i in range(BLOCKS)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+
+    return size
+
+
+# The fields are shared between blocks, so only the objects themselves are measured.
+data = []
+output = {"recipient": 1}
+transaction_input = {"address": "sender"}
+results = {
+    "Block (slots)": measure(lambda i: Block(i, "last_hash", "hash", data, 3, i)),
+    "Block (__dict__)": measure(lambda i: DictBlock(i, "last_hash", "hash", data, 3, i)),
+    "Transaction (slots)": measure(
+        lambda i: Transaction(id="id", output=output, input=transaction_input)
+    ),
+}
+
+for name, size in results.items():
+    print(f"{name}: {size / 1024 / 1024:.1f} MiB per {BLOCKS} objects")
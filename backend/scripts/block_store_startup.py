@@ -0,0 +1,35 @@
+import tempfile
+import time
+
+from backend.blockchain.block import Block
+from backend.blockchain.block_store import BlockStore
+from backend.config import SECONDS
+
+CHAIN_LENGTHS = [1000, 10000, 100000]
+
+# Startup does not validate stored blocks, so placeholder hashes are enough here.
+transaction = {
+    "id": "12345678",
+    "output": {"recipient": 10, "sender": 990},
+    "input": {"timestamp": 1, "amount": 1000, "address": "sender", "signature": [1, 2]},
+}
+
+for chain_length in CHAIN_LENGTHS:
+    chain = [Block.genesis()]
+
+    for i in range(1, chain_length):
+        chain.append(Block(i, chain[-1].hash, f"{i:064x}", [transaction], 3, i))
+
+    with tempfile.TemporaryDirectory() as directory:
+        block_store = BlockStore(directory)
+        block_store.append(chain)
+        block_store.close()
+
+        start_time: int = time.time_ns()
+        block_store = BlockStore(directory)
+        blocks = block_store.load()
+        startup_time: float = (time.time_ns() - start_time) / SECONDS
+        block_store.close()
+
+    print(f"Chain length: {len(blocks)}")
+    print(f"Time to resume from the block store: {startup_time}")
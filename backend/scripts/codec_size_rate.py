@@ -0,0 +1,48 @@
+import json
+import time
+
+from backend.blockchain.block import Block
+from backend.blockchain.codec import decode_blocks, encode_blocks
+from backend.config import SECONDS
+from backend.wallet.transaction import Transaction
+from backend.wallet.wallet import Wallet
+
+BLOCKS = 1000
+TRANSACTIONS_PER_BLOCK = 10
+
+# Blocks are not validated here, so placeholder hashes are enough.
+wallets = [Wallet() for _ in range(20)]
+transactions = [
+    json.loads(json.dumps(Transaction(wallets[i % len(wallets)], "recipient", 1).to_json()))
+    for i in range(TRANSACTIONS_PER_BLOCK)
+]
+chain = [Block.genesis()]
+
+for i in range(1, BLOCKS):
+    chain.append(Block(time.time_ns(), chain[-1].hash, f"{i:064x}", transactions, 3, i))
+
+
+def measure(encode, decode):
+    start_time: int = time.time_ns()
+    encoded = encode(chain)
+    encode_seconds: float = (time.time_ns() - start_time) / SECONDS
+
+    start_time = time.time_ns()
+    decode(encoded)
+    decode_seconds: float = (time.time_ns() - start_time) / SECONDS
+
+    return len(encoded), encode_seconds, decode_seconds
+
+
+results = {
+    "JSON": measure(
+        lambda blocks: json.dumps([block.to_json() for block in blocks]).encode("utf-8"),
+        lambda data: [Block.from_json(block_json) for block_json in json.loads(data)],
+    ),
+    "Binary": measure(encode_blocks, decode_blocks),
+}
+
+for name, (size, encode_seconds, decode_seconds) in results.items():
+    print(f"{name}: {size / BLOCKS:.0f} bytes per block")
+    print(f"{name}: encoded {BLOCKS / encode_seconds:.0f} blocks per second")
+    print(f"{name}: decoded {BLOCKS / decode_seconds:.0f} blocks per second")
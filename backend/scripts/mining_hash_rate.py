@@ -0,0 +1,33 @@
+import os
+import time
+from typing import List
+
+from backend.blockchain.block import Block
+from backend.blockchain.miner import ParallelMiner
+from backend.config import SECONDS
+
+DIFFICULTY = 18
+BLOCKS = 5
+
+# An old timestamp makes adjust_difficulty lower the difficulty by one, so every
+# block below is mined at exactly DIFFICULTY.
+last_block = Block(1, "benchmark_last_hash", "benchmark_hash", [], DIFFICULTY + 1, 0)
+data = [{"id": f"{i:08}", "output": {"recipient": i}} for i in range(100)]
+
+process_counts: List[int] = sorted({1, 2, 4, 8, 16, os.cpu_count() or 1})
+
+for processes in process_counts:
+    miner = ParallelMiner(processes)
+    hashes = 0
+    start_time: int = time.time_ns()
+
+    for _ in range(BLOCKS):
+        block = miner.mine_block(last_block, data)
+        # The workers advance through their slices in step, so about `nonce`
+        # hashes have been computed when the winning one is found.
+        hashes += block.nonce + 1
+
+    elapsed: float = (time.time_ns() - start_time) / SECONDS
+
+    print(f"Processes: {processes}")
+    print(f"Hash rate: {hashes / elapsed:.0f} hashes per second")
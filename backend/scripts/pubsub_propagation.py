@@ -0,0 +1,72 @@
+import contextlib
+import io
+import threading
+import time
+
+from backend.blockchain.blockchain import Blockchain
+from backend.config import SECONDS
+from backend.pubsub import PubSub
+from backend.transport import LocalBroker, LocalTransport
+from backend.wallet.transaction import Transaction
+from backend.wallet.transaction_pool import TransactionPool
+from backend.wallet.wallet import Wallet
+
+NODE_COUNTS = [2, 4, 8]
+BLOCKS = 5
+TRANSACTIONS = 200
+
+
+def wait_for(condition):
+    while not condition():
+        time.sleep(0.001)
+
+
+def measure(node_count):
+    broker = LocalBroker("localhost", 0)
+    threading.Thread(target=broker.serve_forever, daemon=True).start()
+    port = broker.server_address[1]
+
+    blockchains = [Blockchain() for _ in range(node_count)]
+    pools = [TransactionPool() for _ in range(node_count)]
+    nodes = [
+        PubSub(blockchain, pool, LocalTransport(f"node-{i}", "localhost", port), f"node-{i}")
+        for i, (blockchain, pool) in enumerate(zip(blockchains, pools))
+    ]
+    wait_for(lambda: len(broker.clients) == node_count)
+
+    # Block propagation: from the moment a mined block is broadcast until
+    # every other node has appended it.
+    latencies = []
+
+    for _ in range(BLOCKS):
+        blockchains[0].add_block([])
+        start_time: int = time.time_ns()
+        nodes[0].broadcast_block(blockchains[0].chain[-1])
+        height = len(blockchains[0].chain)
+        wait_for(lambda: all(len(blockchain.chain) == height for blockchain in blockchains))
+        latencies.append((time.time_ns() - start_time) / SECONDS)
+
+    # Transaction throughput: until every other pool holds every transaction.
+    transactions = [Transaction(Wallet(), "recipient", 1) for _ in range(TRANSACTIONS)]
+    start_time = time.time_ns()
+
+    for transaction in transactions:
+        nodes[0].broadcast_transaction(transaction)
+
+    wait_for(lambda: all(len(pool.transaction_map) == TRANSACTIONS for pool in pools[1:]))
+    elapsed: float = (time.time_ns() - start_time) / SECONDS
+
+    broker.shutdown()
+    broker.server_close()
+
+    return sum(latencies) / len(latencies), TRANSACTIONS / elapsed
+
+
+for node_count in NODE_COUNTS:
+    # The listeners log every message; keep that out of the results.
+    with contextlib.redirect_stdout(io.StringIO()):
+        latency, throughput = measure(node_count)
+
+    print(f"Nodes: {node_count}")
+    print(f"Block propagation: {latency * 1000:.1f} ms on average")
+    print(f"Transaction throughput: {throughput:.0f} transactions per second")
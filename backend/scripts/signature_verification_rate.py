@@ -0,0 +1,27 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from backend.config import SECONDS, SIGNATURE_VERIFICATION_THREADS
+from backend.wallet.transaction import Transaction
+from backend.wallet.wallet import Wallet
+
+TRANSACTIONS = 2000
+
+wallets = [Wallet() for _ in range(20)]
+transactions = [
+    Transaction(wallets[i % len(wallets)], "recipient", 1).to_json() for i in range(TRANSACTIONS)
+]
+
+thread_counts: List[int] = sorted({1, 2, 4, 8, SIGNATURE_VERIFICATION_THREADS})
+
+for threads in thread_counts:
+    start_time: int = time.time_ns()
+
+    with ThreadPoolExecutor(threads) as executor:
+        assert all(executor.map(Transaction.verify_signature, transactions))
+
+    elapsed: float = (time.time_ns() - start_time) / SECONDS
+
+    print(f"Threads: {threads}")
+    print(f"Verification rate: {TRANSACTIONS / elapsed:.0f} signatures per second")
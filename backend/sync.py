@@ -0,0 +1,85 @@
+import requests
+
+from backend.blockchain.block import Block
+from backend.blockchain.codec import (
+    MEDIA_TYPE,
+    decode_blocks,
+    encode_blocks,
+    read_varint,
+    write_varint,
+)
+from backend.config import SYNC_BATCH_SIZE
+
+
+def synchronize(blockchain, url, limit=SYNC_BATCH_SIZE):
+    """
+    Download the blocks the local chain is missing from the node at the url.
+
+    The node is sent the locator of the local chain and answers with the
+    missing blocks in batches. Batches that continue the local tip are
+    validated and appended as they arrive; batches of a fork are collected
+    and the fork replaces the local chain once it is complete.
+    """
+    locator = blockchain.locator()
+    fork_height = None
+    fork_blocks = []
+
+    while True:
+        height, blocks, more = request_sync_batch(url, locator, limit)
+
+        if fork_height is None and height == len(blockchain.chain):
+            blockchain.extend_chain(blocks)
+        else:
+            if fork_height is None:
+                fork_height = height
+
+            fork_blocks.extend(blocks)
+
+        if not more or not blocks:
+            break
+
+        locator = [blocks[-1].hash] + locator
+
+    if fork_blocks:
+        blockchain.replace_chain(blockchain.chain[:fork_height] + fork_blocks)
+
+
+def request_sync_batch(url, locator, limit):
+    """
+    Request the next batch of missing blocks, in the binary block encoding
+    unless the node only answers in JSON.
+    """
+    response = requests.post(
+        f"{url}/blockchain/sync",
+        json={"locator": locator, "limit": limit},
+        headers={"Accept": MEDIA_TYPE},
+    )
+
+    if response.headers.get("Content-Type", "").startswith(MEDIA_TYPE):
+        return decode_sync_batch(response.content)
+
+    result = response.json()
+    blocks = [Block.from_json(block_json) for block_json in result["blocks"]]
+
+    return result["height"], blocks, result["more"]
+
+
+def encode_sync_batch(height, blocks, more):
+    """
+    Encode a batch of blocks sent to a syncing peer.
+    """
+    out = bytearray()
+    write_varint(out, height)
+    out.append(1 if more else 0)
+
+    return bytes(out) + encode_blocks(blocks)
+
+
+def decode_sync_batch(content):
+    """
+    Decode a batch of blocks encoded by encode_sync_batch.
+    """
+    height, offset = read_varint(content, 0)
+    blocks, _ = decode_blocks(content, offset + 1)
+
+    return height, blocks, content[offset] == 1
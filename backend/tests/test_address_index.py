@@ -0,0 +1,76 @@
+from backend.blockchain.blockchain import Blockchain
+from backend.wallet.address_index import AddressIndex
+from backend.wallet.transaction import Transaction
+from backend.wallet.wallet import Wallet
+
+
+def blockchain_with_recipients(recipients):
+    blockchain = Blockchain()
+    blockchain.add_block(
+        [Transaction(Wallet(), recipient, 1).to_json() for recipient in recipients]
+    )
+    return blockchain
+
+
+def test_search_prefix():
+    blockchain = blockchain_with_recipients(["abc", "abd", "b", "ab"])
+    address_index = AddressIndex()
+    address_index.sync(blockchain.chain)
+
+    assert address_index.search("ab") == (["ab", "abc", "abd"], None)
+    assert address_index.search("abd") == (["abd"], None)
+    assert address_index.search("x") == ([], None)
+
+
+def test_search_pages():
+    blockchain = blockchain_with_recipients(["abc", "abd", "b", "ab"])
+    address_index = AddressIndex()
+    address_index.sync(blockchain.chain)
+
+    assert address_index.search("ab", limit=2) == (["ab", "abc"], "abc")
+    assert address_index.search("ab", "abc", limit=2) == (["abd"], None)
+
+
+def test_search_all_addresses():
+    blockchain = blockchain_with_recipients(["recipient"])
+    address_index = AddressIndex()
+    address_index.sync(blockchain.chain)
+    expected = sorted(
+        {
+            address
+            for block in blockchain.chain
+            for transaction in block.data
+            for address in transaction["output"]
+        }
+    )
+
+    assert address_index.search() == (expected, None)
+
+
+def test_known_addresses_follow_chain_replacement():
+    blockchain = blockchain_with_recipients(["abc"])
+    assert blockchain.known_addresses("abc") == (["abc"], None)
+
+    fork = blockchain_with_recipients(["abd"])
+    fork.add_block([Transaction(Wallet(), "abe", 1).to_json()])
+    blockchain.replace_chain(fork.chain)
+
+    assert blockchain.known_addresses("ab") == (["abd", "abe"], None)
+
+
+def test_sync_keeps_addresses_sorted():
+    blockchain = blockchain_with_recipients(["c", "a"])
+    address_index = AddressIndex()
+    address_index.sync(blockchain.chain)
+    blockchain.add_block([Transaction(Wallet(), recipient, 1).to_json() for recipient in "db"])
+    address_index.sync(blockchain.chain)
+
+    assert address_index.addresses == sorted(address_index.known)
+    assert [address for address in address_index.addresses if len(address) == 1] == list("abcd")
+
+    fork = blockchain_with_recipients(["f", "e"])
+    fork.add_block([Transaction(Wallet(), "g", 1).to_json()])
+    address_index.sync(fork.chain)
+
+    assert address_index.addresses == sorted(address_index.known)
+    assert [address for address in address_index.addresses if len(address) == 1] == list("efg")
@@ -1,3 +1,4 @@
+import json
 import time
 
 import pytest
@@ -157,3 +158,24 @@ def test_is_valid_block_bad_block_hash(last_block: Block, block: Block) -> None:
 
     with pytest.raises(Exception, match="block hash must be correct"):
         Block.is_valid_block(last_block, block)
+
+
+def test_serialize() -> None:
+    """
+    Tests that the cached encoding of a block follows its reassigned fields.
+    """
+    block = Block.mine_block(Block.genesis(), "foo")
+
+    assert json.loads(block.serialize()) == block.to_json()
+    assert block.serialize() is block.serialize()
+
+    block.hash = "evil_hash"
+
+    assert json.loads(block.serialize())["hash"] == "evil_hash"
+
+
+def test_block_has_no_instance_dict() -> None:
+    """
+    Tests that blocks are slotted.
+    """
+    assert not hasattr(Block.genesis(), "__dict__")
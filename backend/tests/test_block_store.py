@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from backend.blockchain.block_store import INDEX_FILE, LOG_FILE, BlockStore
+from backend.blockchain.blockchain import Blockchain
+
+
+@pytest.fixture
+def blockchain_three_blocks():
+    blockchain = Blockchain()
+    for i in range(3):
+        blockchain.add_block([])
+    return blockchain
+
+
+def test_append_and_load(tmp_path, blockchain_three_blocks):
+    block_store = BlockStore(str(tmp_path))
+    block_store.append(blockchain_three_blocks.chain)
+    block_store.close()
+
+    block_store = BlockStore(str(tmp_path))
+
+    assert len(block_store) == 4
+    assert block_store.load() == blockchain_three_blocks.chain
+
+
+def test_recover_discards_partial_write(tmp_path, blockchain_three_blocks):
+    block_store = BlockStore(str(tmp_path))
+    block_store.append(blockchain_three_blocks.chain[:2])
+    block_store.close()
+
+    with open(os.path.join(tmp_path, LOG_FILE), "ab") as log:
+        log.write(b"\x00\x00\x01\x00partial")
+
+    with open(os.path.join(tmp_path, INDEX_FILE), "ab") as index:
+        index.write(b"\x00\x00")
+
+    block_store = BlockStore(str(tmp_path))
+
+    assert block_store.load() == blockchain_three_blocks.chain[:2]
+
+    block_store.append(blockchain_three_blocks.chain[2:])
+
+    assert BlockStore(str(tmp_path)).load() == blockchain_three_blocks.chain
+
+
+def test_sync_replaces_fork(tmp_path, blockchain_three_blocks):
+    block_store = BlockStore(str(tmp_path))
+    block_store.append(blockchain_three_blocks.chain)
+
+    fork = Blockchain()
+    fork.add_block([])
+    block_store.sync(fork.chain, 1)
+
+    assert block_store.load() == fork.chain
+
+
+def test_attach_persists_and_resumes(tmp_path):
+    blockchain = Blockchain()
+    BlockStore(str(tmp_path)).attach(blockchain)
+    blockchain.add_block([])
+    blockchain.add_block([])
+
+    restarted_blockchain = Blockchain()
+    BlockStore(str(tmp_path)).attach(restarted_blockchain)
+
+    assert restarted_blockchain.chain == blockchain.chain
+
+    restarted_blockchain.add_block([])
+
+    assert BlockStore(str(tmp_path)).load() == restarted_blockchain.chain
@@ -1,7 +1,11 @@
+import threading
+import time
+
 import pytest
 
 from backend.blockchain.block import GENESIS_DATA
 from backend.blockchain.blockchain import Blockchain
+from backend.config import MINING_REWARD_INPUT, STARTING_BALANCE
 from backend.wallet.transaction import Transaction
 from backend.wallet.wallet import Wallet
 
@@ -101,3 +105,387 @@ def test_is_valid_transaction_chain_bad_historic_balance(blockchain_three_blocks
 
     with pytest.raises(Exception, match="has an invalid input amount"):
         Blockchain.is_valid_transaction_chain(blockchain_three_blocks.chain)
+
+
+def test_append_block(blockchain_three_blocks):
+    blockchain = Blockchain()
+    blockchain.replace_chain(blockchain_three_blocks.chain[:-1])
+    blockchain.append_block(blockchain_three_blocks.chain[-1])
+
+    assert blockchain.chain == blockchain_three_blocks.chain
+
+
+def test_append_block_not_extending_tip(blockchain_three_blocks):
+    blockchain = Blockchain()
+
+    with pytest.raises(Exception, match="must extend the local tip"):
+        blockchain.append_block(blockchain_three_blocks.chain[-1])
+
+
+def test_append_block_bad_block(blockchain_three_blocks):
+    blockchain = Blockchain()
+    blockchain_three_blocks.chain[1].data = []
+
+    with pytest.raises(Exception, match="The incoming block is invalid"):
+        blockchain.append_block(blockchain_three_blocks.chain[1])
+
+
+def test_append_block_duplicate_transaction(blockchain_three_blocks):
+    transaction = blockchain_three_blocks.chain[-1].data[0]
+    blockchain_three_blocks.add_block([transaction])
+    block = blockchain_three_blocks.chain.pop()
+
+    with pytest.raises(Exception, match="is not unique"):
+        blockchain_three_blocks.append_block(block)
+
+
+def test_append_block_concurrent_siblings(blockchain_three_blocks, monkeypatch):
+    blockchain = Blockchain()
+    blockchain.replace_chain(blockchain_three_blocks.chain[:2])
+    sibling = Blockchain()
+    sibling.replace_chain(blockchain_three_blocks.chain[:2])
+    sibling.add_block([Transaction(Wallet(), "recipient", 5).to_json()])
+    blocks = [blockchain_three_blocks.chain[2], sibling.chain[2]]
+    is_valid_extension = blockchain.is_valid_extension
+
+    def slow_is_valid_extension(blocks):
+        time.sleep(0.05)
+        is_valid_extension(blocks)
+
+    monkeypatch.setattr(blockchain, "is_valid_extension", slow_is_valid_extension)
+    errors = []
+
+    def append(block):
+        try:
+            blockchain.append_block(block)
+        except Exception as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=append, args=(block,)) for block in blocks]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(blockchain.chain) == 3
+    assert len(errors) == 1
+    assert "must extend the local tip" in errors[0]
+    Blockchain.is_valid_chain(blockchain.chain)
+
+
+def test_replace_chain_extending_tip_keeps_local_blocks(blockchain_three_blocks):
+    blockchain = Blockchain()
+    blockchain.replace_chain(blockchain_three_blocks.chain[:2])
+    local_block = blockchain.chain[1]
+
+    blockchain.replace_chain(blockchain_three_blocks.chain)
+
+    assert blockchain.chain[1] is local_block
+    assert blockchain.chain == blockchain_three_blocks.chain
+
+
+def test_replace_chain_extending_tip_bad_block(blockchain_three_blocks):
+    blockchain = Blockchain()
+    blockchain.replace_chain(blockchain_three_blocks.chain[:2])
+    blockchain_three_blocks.chain[2].hash = "evil_hash"
+
+    with pytest.raises(Exception, match="The incoming chain is invalid"):
+        blockchain.replace_chain(blockchain_three_blocks.chain)
+
+
+def legacy_calculate_balance(chain, address):
+    """
+    The chain-scanning balance calculation used by the reference implementation.
+    """
+    balance = STARTING_BALANCE
+
+    for block in chain:
+        for transaction in block.data:
+            if transaction["input"]["address"] == address:
+                balance = transaction["output"][address]
+            elif address in transaction["output"]:
+                balance += transaction["output"][address]
+
+    return balance
+
+
+def legacy_is_valid_transaction_chain(chain):
+    """
+    The prefix-rescanning implementation of is_valid_transaction_chain,
+    kept as a reference for the single-pass ledger validation.
+    """
+    transaction_ids = set()
+
+    for i in range(len(chain)):
+        block = chain[i]
+        has_mining_reward = False
+
+        for transaction_json in block.data:
+            transaction = Transaction.from_json(transaction_json)
+
+            if transaction.id in transaction_ids:
+                raise Exception(f"Transaction {transaction.id} is not unique")
+
+            transaction_ids.add(transaction.id)
+
+            if transaction.input == MINING_REWARD_INPUT:
+                if has_mining_reward:
+                    raise Exception(
+                        "There can only be one mining reward per block. "
+                        f"Check block with hash: {block.hash}"
+                    )
+
+                has_mining_reward = True
+            else:
+                historic_balance = legacy_calculate_balance(
+                    chain[0:i], transaction.input["address"]
+                )
+
+                if historic_balance != transaction.input["amount"]:
+                    raise Exception(f"Transaction {transaction.id} has an invalid input amount")
+
+            Transaction.is_valid_transaction(transaction)
+
+
+def validation_error(validate, chain):
+    try:
+        validate(chain)
+    except Exception as e:
+        return str(e)
+
+
+def blockchain_with_spending_wallet():
+    blockchain = Blockchain()
+    wallet = Wallet(blockchain)
+    other_wallet = Wallet(blockchain)
+
+    blockchain.add_block([Transaction(wallet, other_wallet.address, 10).to_json()])
+    blockchain.add_block(
+        [
+            Transaction(other_wallet, wallet.address, 25).to_json(),
+            Transaction.reward_transaction(wallet).to_json(),
+        ]
+    )
+    blockchain.add_block([Transaction(wallet, "recipient", 60).to_json()])
+
+    return blockchain, wallet
+
+
+def test_is_valid_transaction_chain_matches_legacy_valid_chain():
+    blockchain, _ = blockchain_with_spending_wallet()
+
+    assert validation_error(Blockchain.is_valid_transaction_chain, blockchain.chain) is None
+    assert validation_error(legacy_is_valid_transaction_chain, blockchain.chain) is None
+
+
+def test_is_valid_transaction_chain_matches_legacy_stale_balance():
+    blockchain, wallet = blockchain_with_spending_wallet()
+    stale_transaction = Transaction(wallet, "recipient", 1)
+    stale_transaction.output[wallet.address] = STARTING_BALANCE - 1
+    stale_transaction.input["amount"] = STARTING_BALANCE
+    stale_transaction.input["signature"] = wallet.sign(stale_transaction.output)
+    blockchain.add_block([stale_transaction.to_json()])
+
+    error = validation_error(Blockchain.is_valid_transaction_chain, blockchain.chain)
+
+    assert "has an invalid input amount" in error
+    assert error == validation_error(legacy_is_valid_transaction_chain, blockchain.chain)
+
+
+def test_is_valid_transaction_chain_matches_legacy_same_block_spends():
+    blockchain, wallet = blockchain_with_spending_wallet()
+    blockchain.add_block(
+        [
+            Transaction(wallet, "recipient", 1).to_json(),
+            Transaction(wallet, "recipient", 2).to_json(),
+        ]
+    )
+
+    error = validation_error(Blockchain.is_valid_transaction_chain, blockchain.chain)
+
+    assert error == validation_error(legacy_is_valid_transaction_chain, blockchain.chain)
+
+
+def test_is_valid_transaction_chain_matches_legacy_invalid_chains(blockchain_three_blocks):
+    transaction = Transaction(Wallet(), "recipient", 1).to_json()
+    reward_1 = Transaction.reward_transaction(Wallet()).to_json()
+    reward_2 = Transaction.reward_transaction(Wallet()).to_json()
+    bad_transaction = Transaction(Wallet(), "recipient", 1)
+    bad_transaction.input["signature"] = Wallet().sign(bad_transaction.output)
+
+    for data in [[transaction, transaction], [reward_1, reward_2], [bad_transaction.to_json()]]:
+        blockchain = Blockchain()
+        blockchain.replace_chain(blockchain_three_blocks.chain)
+        blockchain.add_block(data)
+
+        error = validation_error(Blockchain.is_valid_transaction_chain, blockchain.chain)
+
+        assert error is not None
+        assert error == validation_error(legacy_is_valid_transaction_chain, blockchain.chain)
+
+
+def test_balance_follows_added_blocks():
+    blockchain = Blockchain()
+    wallet = Wallet(blockchain)
+
+    assert blockchain.balance(wallet.address) == STARTING_BALANCE
+
+    blockchain.add_block([Transaction(wallet, "recipient", 40).to_json()])
+
+    assert blockchain.balance(wallet.address) == STARTING_BALANCE - 40
+    assert blockchain.balance("recipient") == STARTING_BALANCE + 40
+
+
+def test_balance_after_fork_replacement(blockchain_three_blocks):
+    blockchain = Blockchain()
+    blockchain.add_block([Transaction(Wallet(), "recipient", 40).to_json()])
+
+    assert blockchain.balance("recipient") == STARTING_BALANCE + 40
+
+    blockchain.replace_chain(blockchain_three_blocks.chain)
+
+    assert blockchain.balance("recipient") == STARTING_BALANCE + 0 + 1 + 2
+
+
+def test_balance_waits_for_chain_changes():
+    blockchain = Blockchain()
+    balances = []
+    thread = threading.Thread(target=lambda: balances.append(blockchain.balance("recipient")))
+
+    with blockchain.lock:
+        thread.start()
+        thread.join(0.05)
+
+        assert balances == []
+
+        blockchain.chain.append(
+            blockchain.miner.mine_block(
+                blockchain.chain[-1], [Transaction(Wallet(), "recipient", 40).to_json()]
+            )
+        )
+
+    thread.join()
+
+    assert balances == [STARTING_BALANCE + 40]
+
+
+def test_hooks_receive_changed_height(blockchain_three_blocks):
+    blockchain = Blockchain()
+    heights = []
+    blockchain.add_hook(lambda blockchain, height: heights.append(height))
+
+    blockchain.replace_chain(blockchain_three_blocks.chain[:2])
+    blockchain.append_block(blockchain_three_blocks.chain[2])
+    blockchain.add_block([])
+
+    fork = Blockchain()
+    for i in range(5):
+        fork.add_block([])
+    blockchain.replace_chain(fork.chain)
+
+    assert heights == [1, 2, 3, 1]
+
+
+def test_range_from_tip(blockchain_three_blocks):
+    chain = blockchain_three_blocks.chain
+
+    for start, end in [(0, 3), (1, 2), (2, 10), (-2, 4), (0, -1), (5, 7)]:
+        assert blockchain_three_blocks.range_from_tip(start, end) == chain[::-1][start:end]
+
+
+def test_page(blockchain_three_blocks):
+    chain = blockchain_three_blocks.chain
+
+    assert blockchain_three_blocks.page(0, 3) == (chain[0:3], 3)
+    assert blockchain_three_blocks.page(3, 3) == (chain[3:4], None)
+    assert blockchain_three_blocks.page(10, 3) == ([], None)
+
+
+def test_extend_chain(blockchain_three_blocks):
+    blockchain = Blockchain()
+    blockchain.extend_chain(blockchain_three_blocks.chain[1:])
+
+    assert blockchain.chain == blockchain_three_blocks.chain
+
+
+def test_extend_chain_bad_block(blockchain_three_blocks):
+    blockchain = Blockchain()
+    blockchain_three_blocks.chain[2].hash = "evil_hash"
+
+    with pytest.raises(Exception, match="The incoming blocks are invalid"):
+        blockchain.extend_chain(blockchain_three_blocks.chain[1:])
+
+    assert len(blockchain.chain) == 1
+
+
+def test_locator():
+    blockchain = Blockchain()
+
+    for i in range(30):
+        blockchain.add_block(i)
+
+    chain = blockchain.chain
+    heights = [30, 29, 28, 27, 26, 25, 24, 23, 22, 21, 19, 15, 7, 0]
+
+    assert blockchain.locator() == [chain[height].hash for height in heights]
+
+
+def test_blocks_after(blockchain_three_blocks):
+    chain = blockchain_three_blocks.chain
+    behind = Blockchain()
+    behind.chain = chain[:2]
+
+    assert blockchain_three_blocks.blocks_after(behind.locator(), 10) == (2, chain[2:], False)
+    assert blockchain_three_blocks.blocks_after(behind.locator(), 1) == (2, chain[2:3], True)
+    assert blockchain_three_blocks.blocks_after(Blockchain().locator(), 10) == (1, chain[1:], False)
+
+
+def test_blocks_after_fork(blockchain_three_blocks):
+    fork = Blockchain()
+    fork.chain = blockchain_three_blocks.chain[:2]
+    fork.add_block("fork-data")
+
+    height, blocks, more = blockchain_three_blocks.blocks_after(fork.locator(), 10)
+
+    assert (height, blocks, more) == (2, blockchain_three_blocks.chain[2:], False)
+
+
+@pytest.fixture
+def parallel_signatures(monkeypatch):
+    monkeypatch.setattr("backend.blockchain.blockchain.SIGNATURE_VERIFICATION_BATCH", 1)
+
+
+def test_verify_signatures(blockchain_three_blocks, parallel_signatures):
+    bad_transaction = Transaction(Wallet(), "recipient", 1)
+    bad_transaction.input["signature"] = Wallet().sign(bad_transaction.output)
+    reward = Transaction.reward_transaction(Wallet())
+    blockchain_three_blocks.add_block([bad_transaction.to_json(), reward.to_json()])
+
+    signatures = Blockchain.verify_signatures(blockchain_three_blocks.chain)
+
+    assert signatures == [{}, {0: True}, {0: True}, {0: True}, {0: False}]
+
+
+def test_is_valid_transaction_chain_parallel_signatures(
+    blockchain_three_blocks, parallel_signatures
+):
+    Blockchain.is_valid_transaction_chain(blockchain_three_blocks.chain)
+
+    bad_transaction = Transaction(Wallet(), "recipient", 1)
+    bad_transaction.input["signature"] = Wallet().sign(bad_transaction.output)
+    blockchain_three_blocks.add_block([bad_transaction.to_json()])
+
+    with pytest.raises(Exception, match="Invalid signature"):
+        Blockchain.is_valid_transaction_chain(blockchain_three_blocks.chain)
+
+
+def test_is_valid_transaction_chain_parallel_signatures_keeps_error_order(
+    blockchain_three_blocks, parallel_signatures
+):
+    transaction = blockchain_three_blocks.chain[-1].data[0]
+    bad_transaction = Transaction(Wallet(), "recipient", 1)
+    bad_transaction.input["signature"] = Wallet().sign(bad_transaction.output)
+    blockchain_three_blocks.add_block([transaction, bad_transaction.to_json()])
+
+    with pytest.raises(Exception, match="is not unique"):
+        Blockchain.is_valid_transaction_chain(blockchain_three_blocks.chain)
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from backend.blockchain.block import Block
+from backend.blockchain.blockchain import Blockchain
+from backend.blockchain.codec import (
+    compress_public_key,
+    decode_block,
+    decode_blocks,
+    encode_block,
+    encode_blocks,
+    read_value,
+    write_value,
+)
+from backend.wallet.transaction import Transaction
+from backend.wallet.wallet import Wallet
+
+
+def round_trip(value):
+    out = bytearray()
+    write_value(out, value)
+    decoded, offset = read_value(bytes(out), 0)
+
+    assert offset == len(out)
+
+    return decoded
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        None,
+        True,
+        False,
+        0,
+        -1,
+        2**300,
+        -(2**70),
+        1.5,
+        "",
+        "text",
+        "ünïcode",
+        "00ff" * 16,
+        "00FF" * 16,
+        "abc",
+        [1, "two", [3.0]],
+        {"b": 1, "a": {"c": None}},
+        {"signature": [1, 2], "public_key": "not a key"},
+        {"signature": [2**256, 1]},
+    ],
+)
+def test_value_round_trip(value):
+    decoded = round_trip(value)
+
+    assert json.dumps(decoded) == json.dumps(value)
+
+
+def test_transaction_round_trip_is_compact():
+    transaction_json = Transaction(Wallet(), "recipient", 1).to_json()
+    out = bytearray()
+    write_value(out, transaction_json)
+
+    assert json.dumps(round_trip(transaction_json)) == json.dumps(transaction_json)
+    assert len(out) < len(json.dumps(transaction_json)) / 2
+
+
+def test_compress_public_key():
+    public_key = Wallet().public_key
+
+    assert len(compress_public_key(public_key)) == 33
+    assert compress_public_key("not a key") is None
+
+
+def test_block_round_trip():
+    blockchain = Blockchain()
+    blockchain.add_block([Transaction(Wallet(), "recipient", 1).to_json()])
+
+    for block in blockchain.chain:
+        decoded = decode_block(encode_block(block))
+
+        assert decoded.serialize() == block.serialize()
+
+    blocks, offset = decode_blocks(encode_blocks(blockchain.chain))
+
+    assert [block.serialize() for block in blocks] == [
+        block.serialize() for block in blockchain.chain
+    ]
+    Blockchain.is_valid_chain(blocks)
+
+
+def test_decode_block_unknown_version():
+    with pytest.raises(Exception, match="Unknown block format version"):
+        decode_block(b"\x00" + encode_block(Block.genesis())[1:])
+
+
+def test_encode_unsupported_value():
+    with pytest.raises(Exception, match="Cannot encode"):
+        write_value(bytearray(), object())
+
+
+def test_block_round_trip_any_data():
+    block = Block.mine_block(Block.genesis(), "test-data")
+
+    assert decode_block(encode_block(block)) == block
@@ -1,4 +1,4 @@
-from backend.utils.crypto_hash import crypto_hash
+from backend.utils.crypto_hash import CryptoHashMidstate, crypto_hash
 
 
 def test_crypto_hash() -> None:
@@ -9,3 +9,16 @@ def test_crypto_hash() -> None:
     """
     assert crypto_hash(1, [2], "three") == crypto_hash(1, "three", [2])
     assert crypto_hash("foo") == "b2213295d564916f89a6a42455567c87c3f480fcd7a1c15e220f17d7169a790b"
+
+
+def test_crypto_hash_midstate() -> None:
+    """
+    Tests that CryptoHashMidstate produces the same hashes as crypto_hash, whichever
+    way the fixed and the changing arguments interleave once serialized and sorted.
+    """
+    fixed_args = ["last_hash", [{"id": "abc", "output": {"foo": 1}}], -5, 12]
+    midstate = CryptoHashMidstate(*fixed_args)
+
+    for args in [(1697, 3, 0), (0, 99, 123456), ("zzz", None), ({"a": 1}, -7), ()]:
+        assert midstate.hexdigest(*args) == crypto_hash(*fixed_args, *args)
+        assert midstate.digest(*args).hex() == crypto_hash(*fixed_args, *args)
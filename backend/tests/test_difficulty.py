@@ -0,0 +1,30 @@
+from backend.utils.difficulty import difficulty_target, meets_difficulty
+from backend.utils.hex_to_binary import hex_to_binary
+
+
+def test_difficulty_target() -> None:
+    """
+    Tests the difficulty_target function for regular and out of range difficulties.
+    """
+    assert difficulty_target(0) == 2**256
+    assert difficulty_target(3) == 2**253
+    assert difficulty_target(256) == 1
+    assert difficulty_target(257) == 0
+    assert difficulty_target(-1) == 0
+
+
+def test_meets_difficulty_matches_hex_to_binary() -> None:
+    """
+    Tests that meets_difficulty agrees with the leading 0's check on the binary string.
+    """
+    for hash in ["0fff", "1fff", "00ab", "0000000000000000bbbabc", "fff", "000"]:
+        for difficulty in range(0, 4 * len(hash) + 2):
+            binary_check = hex_to_binary(hash)[0:difficulty] == "0" * difficulty
+            assert meets_difficulty(hash, difficulty) == binary_check
+
+
+def test_meets_difficulty_invalid_hash() -> None:
+    """
+    Tests that a hash that is not hexadecimal never meets the difficulty.
+    """
+    assert not meets_difficulty("evil_hash", 1)
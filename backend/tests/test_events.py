@@ -0,0 +1,67 @@
+import json
+
+from backend.blockchain.blockchain import Blockchain
+from backend.events import EventStream
+from backend.wallet.transaction import Transaction
+from backend.wallet.transaction_pool import TransactionPool
+from backend.wallet.wallet import Wallet
+
+
+def parse(frame):
+    event, data = frame.rstrip("\n").split("\n")
+
+    return event[len("event: ") :], json.loads(data[len("data: ") :])
+
+
+def test_blocks_event():
+    events = EventStream()
+    blockchain = Blockchain()
+    events.watch_blockchain(blockchain)
+    subscriber = events.subscribe()
+
+    blockchain.add_block("test-data")
+
+    event, data = parse(subscriber.get_nowait())
+    assert event == "blocks"
+    assert data == {"height": 1, "blocks": [json.loads(blockchain.chain[1].serialize())]}
+
+
+def test_transaction_pool_events():
+    events = EventStream()
+    transaction_pool = TransactionPool()
+    events.watch_transaction_pool(transaction_pool)
+    subscriber = events.subscribe()
+    transaction = Transaction(Wallet(), "recipient", 1)
+    blockchain = Blockchain()
+    blockchain.add_block([transaction.to_json()])
+
+    transaction_pool.set_transaction(transaction)
+    transaction_pool.clear_block_transactions(blockchain.chain)
+
+    assert parse(subscriber.get_nowait()) == ("transaction", json.loads(transaction.serialize()))
+    assert parse(subscriber.get_nowait()) == ("transactions-cleared", [transaction.id])
+    assert subscriber.empty()
+
+
+def test_slow_subscriber_is_disconnected():
+    events = EventStream(max_queued=2)
+    subscriber = events.subscribe()
+
+    for i in range(3):
+        events.publish("test", json.dumps(i))
+
+    assert list(events.stream(subscriber)) == [": connected\n\n"]
+    assert subscriber not in events.subscribers
+
+
+def test_stream_heartbeat():
+    events = EventStream()
+    subscriber = events.subscribe()
+    stream = events.stream(subscriber, heartbeat=0.01)
+
+    assert next(stream) == ": connected\n\n"
+    assert next(stream) == ": heartbeat\n\n"
+
+    events.publish("test", "1")
+
+    assert next(stream) == "event: test\ndata: 1\n\n"
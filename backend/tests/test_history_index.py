@@ -0,0 +1,54 @@
+from backend.blockchain.blockchain import Blockchain
+from backend.wallet.history_index import HistoryIndex
+from backend.wallet.transaction import Transaction
+from backend.wallet.wallet import Wallet
+
+
+def test_history_records_senders_and_recipients():
+    blockchain = Blockchain()
+    wallet = Wallet(blockchain)
+    blockchain.add_block([Transaction(wallet, "recipient", 1).to_json()])
+    blockchain.add_block(
+        [
+            Transaction(Wallet(), "recipient", 2).to_json(),
+            Transaction.reward_transaction(wallet).to_json(),
+        ]
+    )
+    history_index = HistoryIndex()
+    history_index.sync(blockchain.chain)
+
+    assert history_index.history(wallet.address) == ([(2, 1), (1, 0)], None)
+    assert history_index.history("recipient") == ([(2, 0), (1, 0)], None)
+    assert history_index.history("unknown") == ([], None)
+
+
+def test_history_pages():
+    blockchain = Blockchain()
+
+    for i in range(5):
+        blockchain.add_block([Transaction(Wallet(), "recipient", 1).to_json()])
+
+    history_index = HistoryIndex()
+    history_index.sync(blockchain.chain)
+
+    assert history_index.history("recipient", limit=2) == ([(5, 0), (4, 0)], 3)
+    assert history_index.history("recipient", 3, limit=2) == ([(3, 0), (2, 0)], 1)
+    assert history_index.history("recipient", 1, limit=2) == ([(1, 0)], None)
+
+
+def test_transaction_history():
+    blockchain = Blockchain()
+    transaction = Transaction(Wallet(), "recipient", 1)
+    blockchain.add_block([transaction.to_json()])
+
+    history, next_cursor = blockchain.transaction_history("recipient")
+
+    assert history == [
+        {
+            "height": 1,
+            "block_hash": blockchain.chain[1].hash,
+            "position": 0,
+            "transaction": transaction.to_json(),
+        }
+    ]
+    assert next_cursor is None
@@ -0,0 +1,102 @@
+import pytest
+
+from backend.blockchain.blockchain import Blockchain
+from backend.blockchain.chain_index import ChainIndex
+from backend.config import MINING_REWARD, STARTING_BALANCE
+from backend.tests.test_blockchain import legacy_calculate_balance
+from backend.wallet.ledger import Ledger
+from backend.wallet.transaction import Transaction
+from backend.wallet.wallet import Wallet
+
+
+def test_ledger_starting_balance():
+    assert Ledger().balance("address") == STARTING_BALANCE
+
+
+def test_apply_transaction():
+    ledger = Ledger()
+    wallet = Wallet()
+    transaction = Transaction(wallet, "recipient", 50)
+    ledger.apply_transaction(transaction.to_json())
+
+    assert ledger.balance(wallet.address) == STARTING_BALANCE - 50
+    assert ledger.balance("recipient") == STARTING_BALANCE + 50
+
+
+def test_apply_reward_transaction():
+    ledger = Ledger()
+    wallet = Wallet()
+    ledger.apply_transaction(Transaction.reward_transaction(wallet).to_json())
+
+    assert ledger.balance(wallet.address) == STARTING_BALANCE + MINING_REWARD
+    assert list(ledger.balances) == [wallet.address]
+
+
+def test_apply_block_matches_chain_scan():
+    blockchain = Blockchain()
+    wallet = Wallet(blockchain)
+    blockchain.add_block([Transaction(wallet, "recipient", 30).to_json()])
+    blockchain.add_block(
+        [
+            Transaction(Wallet(), wallet.address, 20).to_json(),
+            Transaction.reward_transaction(wallet).to_json(),
+        ]
+    )
+
+    ledger = Ledger()
+    for block in blockchain.chain:
+        ledger.apply_block(block)
+
+    for address in [wallet.address, "recipient"]:
+        assert ledger.balance(address) == legacy_calculate_balance(blockchain.chain, address)
+
+
+def test_sync_applies_new_blocks_only():
+    blockchain = Blockchain()
+    wallet = Wallet(blockchain)
+    ledger = Ledger()
+    ledger.sync(blockchain.chain)
+
+    blockchain.add_block([Transaction(wallet, "recipient", 30).to_json()])
+    ledger.sync(blockchain.chain)
+
+    assert ledger.height == len(blockchain.chain)
+    assert ledger.tip_hash == blockchain.chain[-1].hash
+    assert ledger.balance("recipient") == STARTING_BALANCE + 30
+
+    ledger.sync(blockchain.chain)
+
+    assert ledger.balance("recipient") == STARTING_BALANCE + 30
+
+
+def test_sync_rebuilds_after_reorg():
+    blockchain = Blockchain()
+    blockchain.add_block([Transaction(Wallet(), "recipient", 30).to_json()])
+    ledger = Ledger()
+    ledger.sync(blockchain.chain)
+
+    fork = Blockchain()
+    fork.add_block([Transaction(Wallet(), "recipient", 5).to_json()])
+    fork.add_block([Transaction(Wallet(), "recipient", 7).to_json()])
+    ledger.sync(fork.chain)
+
+    assert ledger.balance("recipient") == STARTING_BALANCE + 12
+
+
+def test_copy_leaves_ledger_untouched():
+    ledger = Ledger()
+    ledger.apply_transaction(Transaction(Wallet(), "recipient", 30).to_json())
+    ledger_copy = ledger.copy()
+    ledger_copy.apply_transaction(Transaction(Wallet(), "recipient", 5).to_json())
+
+    assert ledger_copy.balance("recipient") == STARTING_BALANCE + 35
+    assert ledger.balance("recipient") == STARTING_BALANCE + 30
+
+
+def test_chain_index_requires_reset_and_apply_block():
+    class IncompleteIndex(ChainIndex):
+        def reset(self):
+            pass
+
+    with pytest.raises(TypeError):
+        IncompleteIndex()
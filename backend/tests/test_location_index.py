@@ -0,0 +1,86 @@
+from backend.blockchain.blockchain import Blockchain
+from backend.blockchain.location_index import LocationIndex
+from backend.wallet.transaction import Transaction
+from backend.wallet.wallet import Wallet
+
+
+def test_location_index_records_blocks_and_transactions():
+    blockchain = Blockchain()
+    transaction = Transaction(Wallet(), "recipient", 1).to_json()
+    reward = Transaction.reward_transaction(Wallet()).to_json()
+    blockchain.add_block([transaction, reward])
+    location_index = LocationIndex()
+    location_index.sync(blockchain.chain)
+
+    assert location_index.block_heights == {
+        blockchain.chain[0].hash: 0,
+        blockchain.chain[1].hash: 1,
+    }
+    assert location_index.transaction_locations == {
+        transaction["id"]: (1, 0),
+        reward["id"]: (1, 1),
+    }
+
+
+def test_location_index_skips_non_transaction_data():
+    blockchain = Blockchain()
+    blockchain.add_block("test-data")
+    location_index = LocationIndex()
+    location_index.sync(blockchain.chain)
+
+    assert location_index.block_heights[blockchain.chain[1].hash] == 1
+    assert location_index.transaction_locations == {}
+
+
+def test_transaction_ids_leave_the_index_untouched():
+    blockchain = Blockchain()
+    transaction = Transaction(Wallet(), "recipient", 1).to_json()
+    blockchain.add_block([transaction])
+    location_index = LocationIndex()
+    location_index.sync(blockchain.chain)
+
+    transaction_ids = location_index.transaction_ids()
+    transaction_ids.add("candidate")
+
+    assert transaction["id"] in transaction_ids
+    assert "candidate" in transaction_ids
+    assert "candidate" not in location_index.transaction_locations
+
+
+def test_find_block():
+    blockchain = Blockchain()
+    blockchain.add_block([Transaction(Wallet(), "recipient", 1).to_json()])
+
+    assert blockchain.find_block(blockchain.chain[1].hash) == (1, blockchain.chain[1])
+    assert blockchain.find_block("unknown") is None
+
+
+def test_find_transaction():
+    blockchain = Blockchain()
+    transaction = Transaction(Wallet(), "recipient", 1).to_json()
+    blockchain.add_block([transaction])
+
+    assert blockchain.find_transaction(transaction["id"]) == {
+        "height": 1,
+        "block_hash": blockchain.chain[1].hash,
+        "position": 0,
+        "transaction": transaction,
+    }
+    assert blockchain.find_transaction("unknown") is None
+
+
+def test_find_after_replace_chain():
+    blockchain = Blockchain()
+    transaction = Transaction(Wallet(), "recipient", 1).to_json()
+    blockchain.add_block([transaction])
+    abandoned_hash = blockchain.chain[1].hash
+    blockchain.find_block(abandoned_hash)
+
+    fork = Blockchain()
+    for i in range(2):
+        fork.add_block([Transaction(Wallet(), "recipient", i).to_json()])
+    blockchain.replace_chain(fork.chain)
+
+    assert blockchain.find_block(abandoned_hash) is None
+    assert blockchain.find_transaction(transaction["id"]) is None
+    assert blockchain.find_block(fork.chain[2].hash) == (2, fork.chain[2])
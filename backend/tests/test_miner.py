@@ -0,0 +1,96 @@
+import os
+import time
+
+import pytest
+
+from backend.blockchain import miner as miner_module
+from backend.blockchain.block import Block
+from backend.blockchain.blockchain import Blockchain
+from backend.blockchain.miner import ParallelMiner
+from backend.utils.difficulty import meets_difficulty
+
+
+def test_parallel_mine_block() -> None:
+    """
+    Tests that blocks mined on several processes are valid Blocks.
+    """
+    last_block = Block.genesis()
+    data = ["test-data"]
+    block = ParallelMiner(processes=3).mine_block(last_block, data)
+
+    assert isinstance(block, Block)
+    assert block.data == data
+    assert block.last_hash == last_block.hash
+    assert meets_difficulty(block.hash, block.difficulty)
+    Block.is_valid_block(last_block, block)
+
+
+def test_parallel_mine_block_single_process() -> None:
+    """
+    Tests that a single process ParallelMiner mines in the calling process.
+    """
+    block = ParallelMiner(processes=1).mine_block(Block.genesis(), "test-data")
+
+    Block.is_valid_block(Block.genesis(), block)
+
+
+def test_search_nonce_partition() -> None:
+    """
+    Tests that search_nonce only tries the nonces of its slice of the nonce space.
+    """
+    block = Block.search_nonce(Block.genesis(), "test-data", nonce=2, nonce_step=5)
+
+    assert block is not None
+    assert block.nonce % 5 == 2
+
+
+def test_search_nonce_stopped() -> None:
+    """
+    Tests that search_nonce gives up once should_stop returns True.
+    """
+    last_block = Block(time.time_ns(), "test_last_hash", "test_hash", [], 200, 0)
+
+    assert Block.search_nonce(last_block, "test-data", should_stop=lambda: True) is None
+
+
+def test_blockchain_add_block_parallel() -> None:
+    """
+    Tests that a Blockchain configured with several mining processes stays valid.
+    """
+    blockchain = Blockchain(mining_processes=2)
+    blockchain.add_block([])
+    blockchain.add_block([])
+
+    Blockchain.is_valid_chain(blockchain.chain)
+
+
+def test_parallel_search_stopped() -> None:
+    """
+    Tests that every worker process stops once should_stop returns True.
+    """
+    last_block = Block(time.time_ns(), "test_last_hash", "test_hash", [], 200, 0)
+    miner = ParallelMiner(processes=2)
+
+    assert miner.search(last_block, "test-data", should_stop=lambda: True) is None
+
+
+def test_parallel_mine_block_worker_error() -> None:
+    """
+    Tests that an exception raised in a worker process is raised in the caller.
+    """
+    with pytest.raises(TypeError):
+        ParallelMiner(processes=2).mine_block(Block.genesis(), [{1, 2}])
+
+
+def crash_worker(*args) -> None:
+    os._exit(1)
+
+
+def test_parallel_search_worker_crash(monkeypatch) -> None:
+    """
+    Tests that a worker process dying without a result does not hang the caller.
+    """
+    monkeypatch.setattr(miner_module, "search_nonce_worker", crash_worker)
+
+    with pytest.raises(Exception, match="exited without reporting"):
+        ParallelMiner(processes=2).search(Block.genesis(), "test-data")
@@ -0,0 +1,167 @@
+import time
+
+from backend.blockchain.block import Block
+from backend.blockchain.blockchain import Blockchain
+from backend.config import MINING_REWARD
+from backend.mining import MiningService
+from backend.wallet.transaction import Transaction
+from backend.wallet.transaction_pool import TransactionPool
+from backend.wallet.wallet import Wallet
+
+
+class FakePubSub:
+    def __init__(self):
+        self.blocks = []
+
+    def broadcast_block(self, block):
+        self.blocks.append(block)
+
+
+def mining_service():
+    blockchain = Blockchain()
+    return MiningService(blockchain, TransactionPool(), Wallet(blockchain), FakePubSub())
+
+
+def test_submit_mines_block():
+    service = mining_service()
+    transaction = Transaction(Wallet(), "recipient", 1)
+    service.transaction_pool.set_transaction(transaction)
+
+    job = service.submit()
+
+    assert job.wait(timeout=10)
+    assert job.status == "mined"
+    assert service.blockchain.chain[-1] == job.block
+    assert service.pubsub.blocks == [job.block]
+    assert job.block.data[0]["id"] == transaction.id
+    assert job.block.data[-1]["output"] == {service.wallet.address: MINING_REWARD}
+    assert transaction.id not in service.transaction_pool.transaction_map
+    assert service.get_job(job.id) is job
+    assert service.status()["blocks_mined"] == 1
+
+
+def test_submitted_jobs_extend_each_other():
+    service = mining_service()
+    jobs = [service.submit() for _ in range(3)]
+
+    for job in jobs:
+        assert job.wait(timeout=10)
+        assert job.status == "mined"
+
+    assert len(service.blockchain.chain) == 4
+    Blockchain.is_valid_chain(service.blockchain.chain)
+
+
+def test_failed_job(monkeypatch):
+    service = mining_service()
+
+    def fail(*args):
+        raise Exception("mining failure")
+
+    monkeypatch.setattr(service.blockchain.miner, "search", fail)
+    job = service.submit()
+
+    assert job.wait(timeout=10)
+    assert job.status == "failed"
+    assert "mining failure" in job.error
+    assert len(service.blockchain.chain) == 1
+
+
+def test_invalid_transaction_is_dropped():
+    service = mining_service()
+    transaction = Transaction(Wallet(), "recipient", 1)
+    transaction.input["signature"] = Wallet().sign(transaction.output)
+    service.transaction_pool.set_transaction(transaction)
+
+    job = service.submit()
+
+    assert job.wait(timeout=10)
+    assert job.status == "mined"
+    assert [transaction_json["id"] for transaction_json in job.block.data[:-1]] == []
+    assert transaction.id not in service.transaction_pool.transaction_map
+
+
+def test_stale_transaction_is_dropped():
+    service = mining_service()
+    wallet = Wallet(service.blockchain)
+    stale = Transaction(wallet, "recipient", 1)
+    service.transaction_pool.set_transaction(stale)
+    service.blockchain.add_block([Transaction(Wallet(), wallet.address, 5).to_json()])
+    valid = Transaction(Wallet(), "recipient", 2)
+    service.transaction_pool.set_transaction(valid)
+
+    jobs = [service.submit() for _ in range(2)]
+
+    for job in jobs:
+        assert job.wait(timeout=10)
+        assert job.status == "mined"
+
+    assert [transaction_json["id"] for transaction_json in jobs[0].block.data[:-1]] == [valid.id]
+    assert service.transaction_pool.transaction_map == {}
+    assert len(service.blockchain.chain) == 4
+
+
+def test_failed_jobs_back_off(monkeypatch):
+    service = mining_service()
+
+    def fail(*args):
+        raise Exception("mining failure")
+
+    monkeypatch.setattr(service.blockchain.miner, "search", fail)
+    service.start()
+    time.sleep(0.3)
+    service.stop()
+
+    assert len(service.jobs) <= 2
+
+
+def test_start_and_stop():
+    service = mining_service()
+    service.start()
+
+    assert service.status()["running"]
+
+    service.stop()
+    job = service.submit()
+
+    assert job.wait(timeout=10)
+    assert not service.status()["running"]
+    assert service.status()["blocks_mined"] >= 1
+
+
+def test_interrupt_restarts_mining_on_new_tip():
+    service = mining_service()
+    blockchain = service.blockchain
+    stale_tip = Block(time.time_ns(), blockchain.chain[-1].hash, "stale_tip_hash", [], 60, 0)
+    blockchain.chain.append(stale_tip)
+
+    job = service.submit()
+
+    while service.status()["current_job"] != job.id:
+        time.sleep(0.01)
+
+    competing_block = Block(1, stale_tip.hash, "competing_hash", [], 2, 0)
+    blockchain.chain.append(competing_block)
+    service.interrupt()
+
+    assert job.wait(timeout=10)
+    assert job.status == "mined"
+    assert job.block.last_hash == competing_block.hash
+    assert service.status()["mining_restarts"] == 1
+    assert service.status()["abandoned_mining_seconds"] > 0
+
+
+def test_block_template_caps_transactions(monkeypatch):
+    monkeypatch.setattr("backend.mining.BLOCK_MAX_TRANSACTIONS", 2)
+    service = mining_service()
+    transactions = [Transaction(Wallet(), "recipient", i) for i in range(1, 4)]
+
+    for transaction in transactions:
+        service.transaction_pool.set_transaction(transaction)
+
+    template = service.block_template()
+
+    assert [transaction_json["id"] for transaction_json in template[:-1]] == [
+        transaction.id for transaction in transactions[:2]
+    ]
+    assert template[-1]["output"] == {service.wallet.address: MINING_REWARD}
@@ -0,0 +1,140 @@
+from backend.blockchain.blockchain import Blockchain
+from backend.pubsub import CHANNELS, Listener, batch_messages
+from backend.wallet.transaction import Transaction
+from backend.wallet.transaction_pool import TransactionPool
+from backend.wallet.wallet import Wallet
+
+
+class FakeMessage:
+    def __init__(self, channel, message, publisher=None):
+        self.channel = channel
+        self.message = message
+        self.publisher = publisher
+
+
+class FakeMiningService:
+    def __init__(self):
+        self.interrupts = 0
+
+    def interrupt(self):
+        self.interrupts += 1
+
+
+def test_listener_appends_block():
+    blockchain = Blockchain()
+    transaction_pool = TransactionPool()
+    mining_service = FakeMiningService()
+    listener = Listener(blockchain, transaction_pool, mining_service)
+
+    transaction = Transaction(Wallet(), "recipient", 1)
+    transaction_pool.set_transaction(transaction)
+    peer_blockchain = Blockchain()
+    peer_blockchain.add_block([transaction.to_json()])
+    block = peer_blockchain.chain[-1]
+
+    listener.message(None, FakeMessage(CHANNELS["BLOCK"], block.to_json()))
+
+    assert blockchain.chain[-1] == block
+    assert transaction.id not in transaction_pool.transaction_map
+    assert mining_service.interrupts == 1
+
+
+def test_listener_rejects_block_not_extending_tip():
+    blockchain = Blockchain()
+    mining_service = FakeMiningService()
+    listener = Listener(blockchain, TransactionPool(), mining_service)
+
+    peer_blockchain = Blockchain()
+    peer_blockchain.add_block([])
+    peer_blockchain.add_block([])
+
+    listener.message(None, FakeMessage(CHANNELS["BLOCK"], peer_blockchain.chain[-1].to_json()))
+
+    assert len(blockchain.chain) == 1
+    assert mining_service.interrupts == 0
+
+
+def test_listener_admits_valid_transaction():
+    blockchain = Blockchain()
+    transaction_pool = TransactionPool()
+    listener = Listener(blockchain, transaction_pool)
+    transaction = Transaction(Wallet(), "recipient", 1)
+
+    listener.message(None, FakeMessage(CHANNELS["TRANSACTION"], transaction.to_json()))
+
+    assert transaction.id in transaction_pool.transaction_map
+
+
+def test_listener_drops_invalid_transaction():
+    blockchain = Blockchain()
+    transaction_pool = TransactionPool()
+    listener = Listener(blockchain, transaction_pool)
+    transaction = Transaction(Wallet(), "recipient", 1)
+    transaction.input["signature"] = Wallet().sign(transaction.output)
+
+    listener.message(None, FakeMessage(CHANNELS["TRANSACTION"], transaction.to_json()))
+
+    assert transaction.id not in transaction_pool.transaction_map
+
+
+def test_listener_drops_malformed_messages():
+    blockchain = Blockchain()
+    transaction_pool = TransactionPool()
+    listener = Listener(blockchain, transaction_pool)
+    transaction = Transaction(Wallet(), "recipient", 1)
+
+    listener.message(None, FakeMessage(CHANNELS["BLOCK"], {"hash": "malformed"}))
+    listener.message(
+        None, FakeMessage(CHANNELS["TRANSACTION"], [{"id": "malformed"}, transaction.to_json()])
+    )
+
+    assert len(blockchain.chain) == 1
+    assert list(transaction_pool.transaction_map) == [transaction.id]
+
+
+def test_listener_admits_transaction_batch():
+    blockchain = Blockchain()
+    transaction_pool = TransactionPool()
+    listener = Listener(blockchain, transaction_pool)
+    transactions = [Transaction(Wallet(), "recipient", 1) for _ in range(2)]
+
+    listener.message(
+        None,
+        FakeMessage(
+            CHANNELS["TRANSACTION"], [transaction.to_json() for transaction in transactions]
+        ),
+    )
+
+    assert list(transaction_pool.transaction_map) == [
+        transaction.id for transaction in transactions
+    ]
+
+
+def test_listener_ignores_own_messages():
+    blockchain = Blockchain()
+    transaction_pool = TransactionPool()
+    listener = Listener(blockchain, transaction_pool, origin="node")
+    transaction = Transaction(Wallet(), "recipient", 1)
+
+    listener.message(None, FakeMessage(CHANNELS["TRANSACTION"], transaction.to_json(), "node"))
+
+    assert transaction.id not in transaction_pool.transaction_map
+
+    listener.message(None, FakeMessage(CHANNELS["TRANSACTION"], transaction.to_json(), "peer"))
+
+    assert transaction.id in transaction_pool.transaction_map
+
+
+def test_batch_messages():
+    batch = [
+        (CHANNELS["TRANSACTION"], {"id": 1}),
+        (CHANNELS["TRANSACTION"], {"id": 2}),
+        (CHANNELS["BLOCK"], {"hash": "a"}),
+        (CHANNELS["TRANSACTION"], {"id": 3}),
+    ]
+
+    assert batch_messages(batch) == [
+        (CHANNELS["TRANSACTION"], [{"id": 1}, {"id": 2}]),
+        (CHANNELS["BLOCK"], {"hash": "a"}),
+        (CHANNELS["TRANSACTION"], {"id": 3}),
+    ]
@@ -0,0 +1,100 @@
+import pytest
+from flask import Flask, Response, jsonify, request
+
+from backend.app.response_cache import ResponseCache
+from backend.blockchain.blockchain import Blockchain
+
+
+@pytest.fixture
+def cached_app():
+    blockchain = Blockchain()
+    response_cache = ResponseCache(max_entries=2)
+    response_cache.watch_blockchain(blockchain)
+    app = Flask(__name__)
+    calls = []
+
+    @app.route("/length")
+    @response_cache.cached
+    def route_length():
+        calls.append(request.args.get("n"))
+        return jsonify(len(blockchain.chain))
+
+    @app.route("/stream")
+    @response_cache.cached
+    def route_stream():
+        calls.append("stream")
+        return Response((block.serialize() for block in blockchain.chain))
+
+    return app.test_client(), blockchain, response_cache, calls
+
+
+def test_cached_until_the_tip_changes(cached_app):
+    client, blockchain, response_cache, calls = cached_app
+
+    assert client.get("/length").json == 1
+    assert client.get("/length").json == 1
+    assert len(calls) == 1
+
+    blockchain.add_block("test-data")
+
+    assert response_cache.entries == {}
+    assert client.get("/length").json == 2
+    assert len(calls) == 2
+
+
+def test_cached_per_query_arguments(cached_app):
+    client, blockchain, response_cache, calls = cached_app
+
+    client.get("/length?n=1")
+    client.get("/length?n=2")
+    client.get("/length?n=1")
+
+    assert calls == ["1", "2"]
+
+
+def test_least_recently_used_entries_are_evicted(cached_app):
+    client, blockchain, response_cache, calls = cached_app
+
+    for n in ["1", "2", "1", "3", "1", "2"]:
+        client.get(f"/length?n={n}")
+
+    assert calls == ["1", "2", "3", "2"]
+
+
+def test_if_none_match(cached_app):
+    client, blockchain, response_cache, calls = cached_app
+
+    response = client.get("/length")
+    etag = response.headers["ETag"]
+
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    not_modified = client.get("/length", headers={"If-None-Match": etag})
+
+    assert not_modified.status_code == 304
+    assert not_modified.data == b""
+
+    blockchain.add_block("test-data")
+    modified = client.get("/length", headers={"If-None-Match": etag})
+
+    assert modified.status_code == 200
+    assert modified.json == 2
+    assert modified.headers["ETag"] != etag
+
+
+def test_streamed_responses_are_not_cached(cached_app):
+    client, blockchain, response_cache, calls = cached_app
+
+    response = client.get("/stream")
+    etag = response.headers["ETag"]
+
+    assert response.is_streamed
+    assert response.data == blockchain.chain[0].serialize().encode("utf-8")
+    assert client.get("/stream").status_code == 200
+    assert calls == ["stream", "stream"]
+    assert response_cache.entries == {}
+
+    not_modified = client.get("/stream", headers={"If-None-Match": etag})
+
+    assert not_modified.status_code == 304
+    assert calls == ["stream", "stream"]
@@ -0,0 +1,96 @@
+import pytest
+
+from backend.blockchain.blockchain import Blockchain
+from backend.blockchain.codec import MEDIA_TYPE
+from backend.sync import encode_sync_batch, synchronize
+from backend.wallet.transaction import Transaction
+from backend.wallet.wallet import Wallet
+
+
+class FakeResponse:
+    def __init__(self, result=None, content=None):
+        self.result = result
+        self.content = content
+        self.headers = {"Content-Type": MEDIA_TYPE} if content is not None else {}
+
+    def json(self):
+        return self.result
+
+
+def serialized(chain):
+    return [block.serialize() for block in chain]
+
+
+@pytest.fixture
+def peer_blockchain():
+    blockchain = Blockchain()
+    for i in range(5):
+        blockchain.add_block([Transaction(Wallet(), "recipient", i).to_json()])
+    return blockchain
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    requests_made = []
+
+    def serve_blockchain(blockchain, binary=True):
+        def post(url, json, headers):
+            requests_made.append(json)
+            height, blocks, more = blockchain.blocks_after(json["locator"], json["limit"])
+
+            if binary:
+                return FakeResponse(content=encode_sync_batch(height, blocks, more))
+
+            return FakeResponse(
+                {"height": height, "blocks": [block.to_json() for block in blocks], "more": more}
+            )
+
+        monkeypatch.setattr("backend.sync.requests.post", post)
+
+        return requests_made
+
+    return serve_blockchain
+
+
+def test_synchronize_extends_local_chain(peer_blockchain, serve):
+    blockchain = Blockchain()
+    blockchain.chain = peer_blockchain.chain[:2]
+    local_block = blockchain.chain[1]
+    requests_made = serve(peer_blockchain)
+
+    synchronize(blockchain, "http://peer", limit=2)
+
+    assert serialized(blockchain.chain) == serialized(peer_blockchain.chain)
+    assert blockchain.chain[1] is local_block
+    assert len(requests_made) == 2
+
+
+def test_synchronize_up_to_date(peer_blockchain, serve):
+    blockchain = Blockchain()
+    blockchain.chain = list(peer_blockchain.chain)
+    requests_made = serve(peer_blockchain)
+
+    synchronize(blockchain, "http://peer")
+
+    assert serialized(blockchain.chain) == serialized(peer_blockchain.chain)
+    assert len(requests_made) == 1
+
+
+def test_synchronize_replaces_fork(peer_blockchain, serve):
+    blockchain = Blockchain()
+    blockchain.chain = peer_blockchain.chain[:2]
+    blockchain.add_block([Transaction(Wallet(), "recipient", 10).to_json()])
+    serve(peer_blockchain)
+
+    synchronize(blockchain, "http://peer", limit=1)
+
+    assert serialized(blockchain.chain) == serialized(peer_blockchain.chain)
+
+
+def test_synchronize_from_json_peer(peer_blockchain, serve):
+    blockchain = Blockchain()
+    serve(peer_blockchain, binary=False)
+
+    synchronize(blockchain, "http://peer", limit=2)
+
+    assert serialized(blockchain.chain) == serialized(peer_blockchain.chain)
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from backend.config import MINING_REWARD, MINING_REWARD_INPUT
@@ -117,3 +119,14 @@ def test_invalid_reward_transaction_invalid_amount():
 
     with pytest.raises(Exception, match="Invalid mining reward"):
         Transaction.is_valid_transaction(reward_transaction)
+
+
+def test_serialize():
+    sender_wallet = Wallet()
+    transaction = Transaction(sender_wallet, "recipient", 50)
+
+    assert transaction.serialize() == json.dumps(transaction.to_json())
+
+    transaction.update(sender_wallet, "next_recipient", 25)
+
+    assert json.loads(transaction.serialize())["output"]["next_recipient"] == 25
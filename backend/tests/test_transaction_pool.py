@@ -1,3 +1,7 @@
+import json
+
+import pytest
+
 from backend.blockchain.blockchain import Blockchain
 from backend.wallet.transaction import Transaction
 from backend.wallet.transaction_pool import TransactionPool
@@ -30,3 +34,138 @@ def test_clear_blockchain_transactions():
 
     assert transaction_1.id not in transaction_pool.transaction_map
     assert transaction_2.id not in transaction_pool.transaction_map
+
+
+def test_existing_transaction():
+    transaction_pool = TransactionPool()
+    wallet = Wallet()
+    transaction = Transaction(wallet, "recipient", 1)
+    transaction_pool.set_transaction(transaction)
+
+    assert transaction_pool.existing_transaction(wallet.address) == transaction
+    assert transaction_pool.existing_transaction(Wallet().address) is None
+
+
+def test_existing_transaction_after_update():
+    transaction_pool = TransactionPool()
+    wallet = Wallet()
+    transaction = Transaction(wallet, "recipient", 1)
+    transaction_pool.set_transaction(transaction)
+
+    transaction.update(wallet, "next_recipient", 2)
+    transaction_pool.set_transaction(transaction)
+
+    assert transaction_pool.existing_transaction(wallet.address) == transaction
+    assert list(transaction_pool.transaction_map) == [transaction.id]
+
+
+def test_clear_block_transactions():
+    transaction_pool = TransactionPool()
+    wallet = Wallet()
+    transaction_1 = Transaction(wallet, "recipient", 1)
+    transaction_2 = Transaction(Wallet(), "recipient", 2)
+
+    transaction_pool.set_transaction(transaction_1)
+    transaction_pool.set_transaction(transaction_2)
+
+    blockchain = Blockchain()
+    blockchain.add_block([transaction_1.to_json()])
+    transaction_pool.clear_block_transactions(blockchain.chain[-1:])
+
+    assert transaction_1.id not in transaction_pool.transaction_map
+    assert transaction_pool.existing_transaction(wallet.address) is None
+    assert transaction_2.id in transaction_pool.transaction_map
+
+
+def test_set_transaction_evicts_newest_over_max_transactions():
+    transaction_pool = TransactionPool(max_transactions=2)
+    transaction_1 = Transaction(Wallet(), "recipient", 1)
+    transaction_2 = Transaction(Wallet(), "recipient", 2)
+    transaction_pool.set_transaction(transaction_1)
+    transaction_pool.set_transaction(transaction_2)
+
+    with pytest.raises(Exception, match="The transaction pool is full"):
+        transaction_pool.set_transaction(Transaction(Wallet(), "recipient", 3))
+
+    assert list(transaction_pool.transaction_map) == [transaction_1.id, transaction_2.id]
+
+
+def test_set_transaction_evicts_newest_over_max_bytes():
+    transaction_1 = Transaction(Wallet(), "recipient", 1)
+    transaction_2 = Transaction(Wallet(), "recipient", 2)
+    transaction_pool = TransactionPool(max_bytes=len(json.dumps(transaction_1.to_json())) + 10)
+    transaction_pool.set_transaction(transaction_1)
+
+    with pytest.raises(Exception, match="The transaction pool is full"):
+        transaction_pool.set_transaction(transaction_2)
+
+    assert list(transaction_pool.transaction_map) == [transaction_1.id]
+    assert transaction_pool.total_bytes == len(json.dumps(transaction_1.to_json()))
+
+
+def test_updated_transaction_keeps_its_place():
+    transaction_pool = TransactionPool()
+    wallet = Wallet()
+    transaction_1 = Transaction(wallet, "recipient", 1)
+    transaction_2 = Transaction(Wallet(), "recipient", 2)
+    transaction_pool.set_transaction(transaction_1)
+    transaction_pool.set_transaction(transaction_2)
+
+    transaction_1.update(wallet, "next_recipient", 2)
+    transaction_pool.set_transaction(transaction_1)
+
+    assert list(transaction_pool.transaction_map) == [transaction_1.id, transaction_2.id]
+    assert transaction_pool.total_bytes == sum(
+        len(json.dumps(transaction.to_json())) for transaction in [transaction_1, transaction_2]
+    )
+
+
+def test_transaction_data_oldest_first():
+    transaction_pool = TransactionPool()
+    transactions = [Transaction(Wallet(), "recipient", i) for i in range(1, 4)]
+
+    for transaction in transactions:
+        transaction_pool.set_transaction(transaction)
+
+    assert transaction_pool.transaction_data(2) == [
+        transaction.to_json() for transaction in transactions[:2]
+    ]
+
+
+def test_admit_transaction():
+    transaction_pool = TransactionPool()
+    transaction = Transaction(Wallet(), "recipient", 1)
+
+    transaction_pool.admit_transaction(transaction, Blockchain())
+
+    assert transaction_pool.transaction_map[transaction.id] == transaction
+
+
+def test_admit_transaction_stale_balance():
+    blockchain = Blockchain()
+    wallet = Wallet(blockchain)
+    blockchain.add_block([Transaction(wallet, "recipient", 1).to_json()])
+    transaction_pool = TransactionPool()
+
+    with pytest.raises(Exception, match="has an invalid input amount"):
+        transaction_pool.admit_transaction(Transaction(wallet, "recipient", 1), Blockchain())
+
+    transaction_pool.admit_transaction(Transaction(wallet, "recipient", 1), blockchain)
+
+
+def test_admit_transaction_drops_seen_versions(monkeypatch):
+    transaction_pool = TransactionPool()
+    wallet = Wallet()
+    transaction = Transaction(wallet, "recipient", 1)
+    transaction_pool.admit_transaction(transaction, Blockchain())
+
+    monkeypatch.setattr(Transaction, "is_valid_transaction", None)
+
+    with pytest.raises(Exception, match="was already seen"):
+        transaction_pool.admit_transaction(Transaction.from_json(transaction.to_json()), None)
+
+    monkeypatch.undo()
+    transaction.update(wallet, "next_recipient", 2)
+    transaction_pool.admit_transaction(transaction, Blockchain())
+
+    assert transaction_pool.transaction_map[transaction.id].output["next_recipient"] == 2
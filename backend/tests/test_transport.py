@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from backend.blockchain.blockchain import Blockchain
+from backend.pubsub import PubSub
+from backend.transport import LocalBroker, LocalTransport
+from backend.wallet.transaction import Transaction
+from backend.wallet.transaction_pool import TransactionPool
+from backend.wallet.wallet import Wallet
+
+
+class FakeListener:
+    def __init__(self):
+        self.messages = []
+
+    def message(self, pubnub, message_object):
+        self.messages.append(
+            (message_object.channel, message_object.message, message_object.publisher)
+        )
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def broker():
+    broker = LocalBroker("localhost", 0)
+    threading.Thread(target=broker.serve_forever, daemon=True).start()
+    yield broker
+    broker.shutdown()
+    broker.server_close()
+
+
+def local_transport(broker, origin):
+    return LocalTransport(origin, "localhost", broker.server_address[1])
+
+
+def test_local_transport_relays_to_subscribers(broker):
+    transport_1 = local_transport(broker, "node-1")
+    transport_2 = local_transport(broker, "node-2")
+    listener_1 = FakeListener()
+    listener_2 = FakeListener()
+    transport_1.subscribe(["BLOCK"], listener_1)
+    transport_2.subscribe(["TRANSACTION"], listener_2)
+    wait_for(lambda: len(broker.clients) == 2)
+
+    transport_1.publish("TRANSACTION", {"foo": "bar"})
+
+    wait_for(lambda: listener_2.messages)
+    assert listener_2.messages == [("TRANSACTION", {"foo": "bar"}, "node-1")]
+    assert listener_1.messages == []
+
+
+def test_pubsub_over_local_transport(broker):
+    pools = [TransactionPool() for _ in range(2)]
+    nodes = [
+        PubSub(Blockchain(), pool, local_transport(broker, origin), origin)
+        for pool, origin in zip(pools, ["node-1", "node-2"])
+    ]
+    wait_for(lambda: len(broker.clients) == 2)
+    transaction = Transaction(Wallet(), "recipient", 1)
+
+    nodes[0].broadcast_transaction(transaction)
+    nodes[0].flush()
+
+    wait_for(lambda: transaction.id in pools[1].transaction_map)
+    assert transaction.id not in pools[0].transaction_map
+
+
+class FailingListener(FakeListener):
+    def message(self, pubnub, message_object):
+        if message_object.message == "fail":
+            raise Exception("listener failure")
+
+        super().message(pubnub, message_object)
+
+
+def test_local_transport_survives_bad_frames(broker):
+    transport_1 = local_transport(broker, "node-1")
+    transport_2 = local_transport(broker, "node-2")
+    listener = FailingListener()
+    transport_2.subscribe(["TRANSACTION"], listener)
+    wait_for(lambda: len(broker.clients) == 2)
+
+    transport_1.file.write(b"not json\n")
+    transport_1.file.flush()
+    transport_1.publish("TRANSACTION", "fail")
+    transport_1.publish("TRANSACTION", {"foo": "bar"})
+
+    wait_for(lambda: listener.messages)
+    assert listener.messages == [("TRANSACTION", {"foo": "bar"}, "node-1")]
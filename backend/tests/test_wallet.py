@@ -29,3 +29,15 @@ def test_calculate_balance():
     blockchain.add_block([transaction.to_json()])
 
     assert Wallet.calculate_balance(blockchain, wallet.address) == STARTING_BALANCE - amount
+
+
+def test_verify_reuses_parsed_public_key():
+    data = {"foo": "test_data"}
+    wallet = Wallet()
+    signature = wallet.sign(data)
+
+    Wallet.verify(wallet.public_key, data, signature)
+    hits = Wallet.public_key_cache_info()["hits"]
+    assert Wallet.verify(wallet.public_key, data, signature)
+
+    assert Wallet.public_key_cache_info()["hits"] == hits + 1
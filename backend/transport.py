@@ -0,0 +1,180 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+
+from backend.config import LOCAL_BROKER_PORT
+
+
+class TransportMessage:
+    """
+    A message received on a channel, shaped like the messages PubNub delivers.
+    """
+
+    def __init__(self, channel, message, publisher=None):
+        self.channel = channel
+        self.message = message
+        self.publisher = publisher
+
+
+class PubNubTransport:
+    """
+    Carries messages through the hosted PubNub service.
+    """
+
+    def __init__(self, origin):
+        from dotenv import load_dotenv
+        from pubnub.pnconfiguration import PNConfiguration
+        from pubnub.pubnub import PubNub
+
+        load_dotenv()
+
+        pnconfig = PNConfiguration()
+        pnconfig.subscribe_key = os.environ.get("subscribe_key")
+        pnconfig.publish_key = os.environ.get("publish_key")
+        pnconfig.uuid = origin
+        self.pubnub = PubNub(pnconfig)
+
+    def subscribe(self, channels, listener):
+        """
+        Deliver the messages of the channels to the listener.
+        """
+        from pubnub.callbacks import SubscribeCallback
+
+        class Callback(SubscribeCallback):
+            def message(self, pubnub, message_object):
+                listener.message(pubnub, message_object)
+
+        self.pubnub.add_listener(Callback())
+        self.pubnub.subscribe().channels(list(channels)).execute()
+
+    def publish(self, channel, message):
+        """
+        Publish the message object to the channel.
+        """
+        self.pubnub.publish().channel(channel).message(message).sync()
+
+
+class LocalTransport:
+    """
+    Carries messages through a LocalBroker, so that several nodes can talk
+    to each other on one machine without any external service.
+    Messages are sent to the broker as JSON lines.
+    """
+
+    def __init__(self, origin, host="localhost", port=LOCAL_BROKER_PORT):
+        self.origin = origin
+        self.socket = socket.create_connection((host, port))
+        self.file = self.socket.makefile("rwb")
+        self.lock = threading.Lock()
+        self.channels = set()
+        self.listener = None
+
+    def subscribe(self, channels, listener):
+        """
+        Deliver the messages of the channels to the listener.
+        """
+        self.channels.update(channels)
+        self.listener = listener
+        threading.Thread(target=self.receive, daemon=True).start()
+
+    def publish(self, channel, message):
+        """
+        Publish the message object to the channel.
+        """
+        line = json.dumps({"channel": channel, "message": message, "publisher": self.origin})
+
+        with self.lock:
+            self.file.write(line.encode("utf-8") + b"\n")
+            self.file.flush()
+
+    def receive(self):
+        """
+        Deliver the messages relayed by the broker until the connection closes.
+        A frame that cannot be read or handled is reported and skipped.
+        """
+        for line in self.file:
+            try:
+                frame = json.loads(line)
+
+                if frame["channel"] in self.channels:
+                    self.listener.message(
+                        None,
+                        TransportMessage(
+                            frame["channel"], frame["message"], frame.get("publisher")
+                        ),
+                    )
+            except Exception as e:
+                print(f"\n -- Did not handle the message {line[:100]!r}: {e}")
+
+    def close(self):
+        self.socket.close()
+
+
+class LocalBroker(socketserver.ThreadingTCPServer):
+    """
+    Relays every line received from a connected node to all connected nodes.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="localhost", port=LOCAL_BROKER_PORT):
+        super().__init__((host, port), LocalBrokerHandler)
+        self.clients = set()
+        self.lock = threading.Lock()
+
+    def relay(self, line):
+        """
+        Send the line to every connected node. Lines are relayed one at a
+        time, so all nodes receive them in the same order.
+        """
+        with self.lock:
+            for client in list(self.clients):
+                try:
+                    client.write(line)
+                    client.flush()
+                except OSError:
+                    self.clients.discard(client)
+
+
+class LocalBrokerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        with self.server.lock:
+            self.server.clients.add(self.wfile)
+
+        try:
+            for line in self.rfile:
+                self.server.relay(line)
+        finally:
+            with self.server.lock:
+                self.server.clients.discard(self.wfile)
+
+
+def create_transport(origin):
+    """
+    Create the transport selected by the PUBSUB_TRANSPORT environment variable:
+    "local" for a LocalBroker at LOCAL_BROKER_HOST:LOCAL_BROKER_PORT, PubNub otherwise.
+    """
+    if os.environ.get("PUBSUB_TRANSPORT") == "local":
+        return LocalTransport(
+            origin,
+            os.environ.get("LOCAL_BROKER_HOST", "localhost"),
+            int(os.environ.get("LOCAL_BROKER_PORT", LOCAL_BROKER_PORT)),
+        )
+
+    return PubNubTransport(origin)
+
+
+def main():
+    broker = LocalBroker(
+        os.environ.get("LOCAL_BROKER_HOST", "localhost"),
+        int(os.environ.get("LOCAL_BROKER_PORT", LOCAL_BROKER_PORT)),
+    )
+    print(f"\n -- Relaying messages on port {broker.server_address[1]}")
+    broker.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
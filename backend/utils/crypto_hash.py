@@ -1,3 +1,4 @@
+import bisect
 import hashlib
 import json
 from typing import Any
@@ -18,6 +19,73 @@ def crypto_hash(*args: Any) -> str:
     return hashlib.sha256(joined_data.encode("utf-8")).hexdigest()
 
 
+class CryptoHashMidstate:
+    """
+    Incremental crypto_hash for a set of fixed arguments combined with a few
+    arguments that change between calls, e.g. the block fields during mining.
+
+    The fixed arguments are serialized once, and the sha-256 states after each
+    prefix of their sorted serializations are prepared up front. Each call only
+    serializes the changing arguments, resumes from the prepared state via
+    copy() and feeds the remaining pieces in the same sorted order as
+    crypto_hash, so the result is identical to crypto_hash of all arguments.
+    """
+
+    def __init__(self, *fixed_args: Any) -> None:
+        """
+        Serialize the fixed arguments and prepare the prefix states.
+
+        Args:
+            *fixed_args: The arguments shared by every hash.
+        """
+        self.fixed = sorted(map(lambda data: json.dumps(data), fixed_args))
+        self.encoded_fixed = [stringified.encode("utf-8") for stringified in self.fixed]
+        self.states = [hashlib.sha256()]
+
+        for encoded in self.encoded_fixed:
+            state = self.states[-1].copy()
+            state.update(encoded)
+            self.states.append(state)
+
+    def digest(self, *args: Any) -> bytes:
+        """
+        Generate the sha-256 digest of the fixed arguments and the given ones.
+
+        Args:
+            *args: The arguments that change between calls.
+
+        Returns:
+            bytes: The raw sha-256 digest.
+        """
+        stringified_args = sorted(map(lambda data: json.dumps(data), args))
+        index = bisect.bisect_left(self.fixed, stringified_args[0]) if args else len(self.fixed)
+        state = self.states[index].copy()
+
+        for stringified in stringified_args:
+            while index < len(self.fixed) and self.fixed[index] < stringified:
+                state.update(self.encoded_fixed[index])
+                index += 1
+
+            state.update(stringified.encode("utf-8"))
+
+        for encoded in self.encoded_fixed[index:]:
+            state.update(encoded)
+
+        return state.digest()
+
+    def hexdigest(self, *args: Any) -> str:
+        """
+        Generate the sha-256 hash of the fixed arguments and the given ones.
+
+        Args:
+            *args: The arguments that change between calls.
+
+        Returns:
+            str: The same hexadecimal hash as crypto_hash of all the arguments.
+        """
+        return self.digest(*args).hex()
+
+
 def main() -> None:
     """
     Main function to demonstrate the usage of crypto_hash function.
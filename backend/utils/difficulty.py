@@ -0,0 +1,51 @@
+HASH_BITS = 256
+
+
+def difficulty_target(difficulty: int, bits: int = HASH_BITS) -> int:
+    """
+    Calculate the proof of work target for the given difficulty.
+    A hash meets the difficulty when it has at least difficulty leading 0 bits,
+    which is the case exactly when its integer value is below the target.
+
+    Args:
+        difficulty (int): The number of leading 0 bits required.
+        bits (int): The length of the hash in bits.
+
+    Returns:
+        int: The exclusive upper bound for the integer value of the hash.
+    """
+    if difficulty < 0 or difficulty > bits:
+        return 0
+
+    return 1 << (bits - difficulty)
+
+
+def meets_difficulty(hash: str, difficulty: int) -> bool:
+    """
+    Check whether a hexadecimal hash meets the leading 0's proof of work requirement.
+
+    Args:
+        hash (str): The hexadecimal hash.
+        difficulty (int): The number of leading 0 bits required.
+
+    Returns:
+        bool: True if the hash meets the difficulty, False otherwise.
+    """
+    try:
+        value = int(hash, 16)
+    except ValueError:
+        return False
+
+    return value < difficulty_target(difficulty, 4 * len(hash))
+
+
+def main() -> None:
+    """
+    Main function to demonstrate the usage of meets_difficulty function.
+    """
+    print(f"meets_difficulty: {meets_difficulty('0fff', 4)}")
+    print(f"meets_difficulty: {meets_difficulty('1fff', 4)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,12 +28,7 @@ def hex_to_binary(hex_string: str) -> str:
     Returns:
         str: The converted binary string.
     """
-    binary_string = ""
-
-    for character in hex_string:
-        binary_string += HEX_TO_BINARY_CONVERSION_TABLE[character]
-
-    return binary_string
+    return "".join(HEX_TO_BINARY_CONVERSION_TABLE[character] for character in hex_string)
 
 
 def main() -> None:
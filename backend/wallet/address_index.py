@@ -0,0 +1,83 @@
+import bisect
+from typing import Any, List, Optional, Set, Tuple
+
+from backend.blockchain.chain_index import ChainIndex
+
+
+class AddressIndex(ChainIndex):
+    """
+    The addresses that received an output in a chain of blocks, kept sorted
+    so they can be searched by prefix and paged through without walking
+    the chain.
+
+    When the index is built from the genesis block, the addresses are sorted
+    once at the end of the sync; later blocks insert their new addresses in
+    place.
+    """
+
+    def reset(self) -> None:
+        self.addresses: List[str] = []
+        self.known: Set[str] = set()
+        self.sorted = False
+
+    def apply_block(self, block: Any) -> None:
+        """
+        Add the recipients of the transactions of the block.
+
+        Args:
+            block (Block): The Block to index.
+        """
+        for transaction_json in block.data:
+            for address in transaction_json["output"]:
+                if address not in self.known:
+                    self.known.add(address)
+
+                    if self.sorted:
+                        bisect.insort(self.addresses, address)
+                    else:
+                        self.addresses.append(address)
+
+    def finish_sync(self) -> None:
+        if not self.sorted:
+            self.addresses.sort()
+            self.sorted = True
+
+    def search(
+        self, prefix: str = "", cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[str], Optional[str]]:
+        """
+        Return up to limit addresses starting with the prefix, in sorted order.
+
+        Args:
+            prefix (str): The start of the addresses to find.
+            cursor (str, optional): Only return addresses after this one,
+                typically the last address of the previous page.
+            limit (int): Maximum number of addresses to return.
+
+        Returns:
+            Tuple[List[str], Optional[str]]: The addresses, and the cursor of
+            the next page, None once there are no more matches.
+        """
+        with self.lock:
+            if cursor is not None and cursor >= prefix:
+                start = bisect.bisect_right(self.addresses, cursor)
+            else:
+                start = bisect.bisect_left(self.addresses, prefix)
+
+            addresses = []
+            position = start
+
+            while position < len(self.addresses) and len(addresses) < max(limit, 0):
+                address = self.addresses[position]
+
+                if not address.startswith(prefix):
+                    break
+
+                addresses.append(address)
+                position += 1
+
+            has_more = position < len(self.addresses) and self.addresses[position].startswith(
+                prefix
+            )
+
+        return addresses, addresses[-1] if has_more and addresses else None
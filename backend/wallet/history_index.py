@@ -0,0 +1,56 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.blockchain.chain_index import ChainIndex
+from backend.config import MINING_REWARD_INPUT
+
+
+class HistoryIndex(ChainIndex):
+    """
+    The transactions of every address in a chain of blocks, as the
+    (block height, position in the block) of each transaction the address
+    sent or received, oldest first.
+    """
+
+    def reset(self) -> None:
+        self.locations: Dict[str, List[Tuple[int, int]]] = {}
+
+    def apply_block(self, block: Any) -> None:
+        """
+        Record the transactions of the block under their sender and recipients.
+
+        Args:
+            block (Block): The Block to index, at height self.height.
+        """
+        for position, transaction_json in enumerate(block.data):
+            addresses = set(transaction_json["output"])
+
+            if transaction_json["input"] != MINING_REWARD_INPUT:
+                addresses.add(transaction_json["input"]["address"])
+
+            for address in addresses:
+                self.locations.setdefault(address, []).append((self.height, position))
+
+    def history(
+        self, address: str, cursor: Optional[int] = None, limit: int = 100
+    ) -> Tuple[List[Tuple[int, int]], Optional[int]]:
+        """
+        Return up to limit transaction locations of the address, newest first.
+
+        Args:
+            address (str): The wallet address.
+            cursor (int, optional): Only return the transactions before this
+                one, counted from the oldest. None starts at the newest.
+            limit (int): Maximum number of locations to return.
+
+        Returns:
+            Tuple[List[Tuple[int, int]], Optional[int]]: The (block height,
+            position) of the transactions, and the cursor of the next page,
+            None once the oldest transaction is reached.
+        """
+        with self.lock:
+            locations = self.locations.get(address, [])
+            end = len(locations) if cursor is None else min(max(cursor, 0), len(locations))
+            start = max(end - max(limit, 0), 0)
+            page = locations[start:end][::-1]
+
+        return page, start if start > 0 else None
@@ -0,0 +1,72 @@
+from collections import ChainMap
+from typing import Any, Dict, MutableMapping
+
+from backend.blockchain.chain_index import ChainIndex
+from backend.config import MINING_REWARD_INPUT, STARTING_BALANCE
+
+
+class Ledger(ChainIndex):
+    """
+    Running balances of the addresses recorded in a chain of blocks.
+    Applies the balance rules of Wallet.calculate_balance block by block,
+    so a whole chain is accounted for in a single pass.
+    """
+
+    def reset(self) -> None:
+        self.balances: MutableMapping[str, int] = {}
+
+    def balance(self, address: str) -> int:
+        """
+        Return the current balance of the address.
+
+        Args:
+            address (str): The wallet address.
+
+        Returns:
+            int: The balance, STARTING_BALANCE for addresses not seen yet.
+        """
+        return self.balances.get(address, STARTING_BALANCE)
+
+    def copy(self) -> "Ledger":
+        """
+        Return a ledger starting from the current balances.
+        Changes made to the copy are kept apart and leave this ledger untouched,
+        which lets candidate blocks be checked without copying every balance.
+
+        Returns:
+            Ledger: The copied Ledger.
+        """
+        ledger = Ledger()
+        ledger.balances = ChainMap({}, self.balances)
+        ledger.height = self.height
+        ledger.tip_hash = self.tip_hash
+
+        return ledger
+
+    def apply_block(self, block: Any) -> None:
+        """
+        Apply the transactions of the block, in order, to the balances.
+
+        Args:
+            block (Block): The Block to account for.
+        """
+        for transaction_json in block.data:
+            self.apply_transaction(transaction_json)
+
+    def apply_transaction(self, transaction_json: Dict[str, Any]) -> None:
+        """
+        Apply a serialized transaction to the balances.
+        The sender's balance becomes its change output, every other output
+        is added to the balance of its recipient.
+
+        Args:
+            transaction_json (dict): A JSON representation of a Transaction.
+        """
+        sender = transaction_json["input"]["address"]
+
+        for address, amount in transaction_json["output"].items():
+            if address != sender:
+                self.balances[address] = self.balance(address) + amount
+
+        if transaction_json["input"] != MINING_REWARD_INPUT:
+            self.balances[sender] = transaction_json["output"].get(sender, 0)
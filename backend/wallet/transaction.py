@@ -1,3 +1,4 @@
+import json
 import time
 import uuid
 
@@ -9,8 +10,12 @@ class Transaction:
     """
     Document of an exchange in currency from a sender to one
     or more recipients.
+    Transactions are slotted, and cache their JSON encoding until a field
+    is reassigned.
     """
 
+    __slots__ = ("id", "output", "input", "_serialized")
+
     def __init__(
         self, sender_wallet=None, recipient=None, amount=None, id=None, output=None, input=None
     ):
@@ -18,6 +23,13 @@ class Transaction:
         self.output = output or self.create_output(sender_wallet, recipient, amount)
         self.input = input or self.create_input(sender_wallet, self.output)
 
+    def __setattr__(self, name, value):
+        """
+        Set a field of the transaction, dropping its cached encoding.
+        """
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "_serialized", None)
+
     def create_output(self, sender_wallet, recipient, amount):
         """
         Structure the output data for the transaction.
@@ -64,7 +76,16 @@ class Transaction:
         """
         Serialize the transaction.
         """
-        return self.__dict__
+        return {"id": self.id, "output": self.output, "input": self.input}
+
+    def serialize(self):
+        """
+        Return the JSON encoding of the transaction, cached after the first call.
+        """
+        if self._serialized is None:
+            object.__setattr__(self, "_serialized", json.dumps(self.to_json()))
+
+        return self._serialized
 
     @staticmethod
     def from_json(transaction_json):
@@ -75,10 +96,12 @@ class Transaction:
         return Transaction(**transaction_json)
 
     @staticmethod
-    def is_valid_transaction(transaction):
+    def is_valid_transaction(transaction, signature_valid=None):
         """
         Validate a transaction.
         Raise an exception for invalid transactions.
+        The signature is verified here unless signature_valid already holds
+        the outcome of verifying it.
         """
         if transaction.input == MINING_REWARD_INPUT:
             if list(transaction.output.values()) != [MINING_REWARD]:
@@ -90,11 +113,30 @@ class Transaction:
         if transaction.input["amount"] != output_total:
             raise Exception("Invalid transaction output values")
 
-        if not Wallet.verify(
-            transaction.input["public_key"], transaction.output, transaction.input["signature"]
-        ):
+        if signature_valid is None:
+            signature_valid = Wallet.verify(
+                transaction.input["public_key"], transaction.output, transaction.input["signature"]
+            )
+
+        if not signature_valid:
             raise Exception("Invalid signature")
 
+    @staticmethod
+    def verify_signature(transaction_json):
+        """
+        Verify the signature of a serialized transaction.
+        Return None when the transaction is too malformed to be verified, so
+        that validating it raises the appropriate error instead.
+        """
+        try:
+            return Wallet.verify(
+                transaction_json["input"]["public_key"],
+                transaction_json["output"],
+                transaction_json["input"]["signature"],
+            )
+        except Exception:
+            return None
+
     @staticmethod
     def reward_transaction(miner_wallet):
         """
@@ -108,11 +150,11 @@ class Transaction:
 
 def main():
     transaction = Transaction(Wallet(), "recipient", 15)
-    print(f"transaction.__dict__: {transaction.__dict__}")
+    print(f"transaction.to_json(): {transaction.to_json()}")
 
     transaction_json = transaction.to_json()
     restored_transaction = Transaction.from_json(transaction_json)
-    print(f"restored_transaction.__dict__: {restored_transaction.__dict__}")
+    print(f"restored_transaction.to_json(): {restored_transaction.to_json()}")
 
 
 if __name__ == "__main__":
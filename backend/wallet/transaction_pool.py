@@ -1,35 +1,212 @@
+import json
+import threading
+from collections import OrderedDict
+
+from backend.config import POOL_MAX_BYTES, POOL_MAX_TRANSACTIONS, RECENT_TRANSACTIONS
+from backend.wallet.transaction import Transaction
+
+
 class TransactionPool:
-    def __init__(self):
+    """
+    The transactions waiting to be mined, bounded in count and in bytes.
+
+    Transactions are prioritized by age: blocks are filled with the oldest
+    transactions first, and once the pool is over its bounds the newest
+    transactions are evicted. An updated transaction keeps its place.
+
+    Transactions received from peers are validated before they are admitted.
+    The most recently seen transactions are remembered, so that repeated
+    ones are dropped without being validated again.
+    """
+
+    def __init__(self, max_transactions=POOL_MAX_TRANSACTIONS, max_bytes=POOL_MAX_BYTES):
         self.transaction_map = {}
+        self.address_map = {}
+        self.sizes = {}
+        self.total_bytes = 0
+        self.max_transactions = max_transactions
+        self.max_bytes = max_bytes
+        self.recent = OrderedDict()
+        self.hooks = []
+        self.lock = threading.RLock()
 
     def set_transaction(self, transaction):
         """
         Set a transaction in the transaction pool.
+        Raise an exception if the pool is full and the transaction was evicted.
         """
-        self.transaction_map[transaction.id] = transaction
+        with self.lock:
+            self.remember(transaction)
+            previous = self.transaction_map.get(transaction.id)
+
+            if previous is not None:
+                self.forget_address(previous)
+
+            size = len(transaction.serialize())
+            self.total_bytes += size - self.sizes.get(transaction.id, 0)
+            self.sizes[transaction.id] = size
+            self.transaction_map[transaction.id] = transaction
+            self.address_map[transaction.input["address"]] = transaction
+
+            evicted = self.evict()
+
+            if transaction.id not in evicted:
+                self.notify_hooks("transaction", transaction)
+
+            cleared = [
+                transaction_id
+                for transaction_id in evicted
+                if transaction_id != transaction.id or previous is not None
+            ]
+
+            if cleared:
+                self.notify_hooks("transactions-cleared", cleared)
+
+        if transaction.id in evicted:
+            raise Exception(f"The transaction pool is full. Dropped transaction {transaction.id}")
+
+    def admit_transaction(self, transaction, blockchain):
+        """
+        Validate a transaction received from a peer, then set it in the pool.
+        Raise an exception if it was seen recently or is invalid.
+        """
+        with self.lock:
+            if self.seen(transaction):
+                raise Exception(f"Transaction {transaction.id} was already seen")
+
+            self.remember(transaction)
+
+        Transaction.is_valid_transaction(transaction)
+
+        if transaction.input["amount"] != blockchain.balance(transaction.input["address"]):
+            raise Exception(f"Transaction {transaction.id} has an invalid input amount")
+
+        self.set_transaction(transaction)
+
+    def seen(self, transaction):
+        """
+        Check whether this version of the transaction was seen recently.
+        Updates reuse the id of the transaction, so versions are told apart
+        by their signature.
+        """
+        return TransactionPool.version(transaction) in self.recent
+
+    def remember(self, transaction):
+        """
+        Remember the transaction as seen, forgetting the oldest transactions
+        beyond RECENT_TRANSACTIONS.
+        """
+        version = TransactionPool.version(transaction)
+        self.recent[version] = None
+        self.recent.move_to_end(version)
+
+        while len(self.recent) > RECENT_TRANSACTIONS:
+            self.recent.popitem(last=False)
+
+    @staticmethod
+    def version(transaction):
+        """
+        Identify a version of a transaction by its id and signature.
+        """
+        return (transaction.id, json.dumps(transaction.input.get("signature")))
+
+    def evict(self):
+        """
+        Delete the newest transactions until the pool is within its bounds.
+        Return the ids of the deleted transactions.
+        """
+        evicted = []
+
+        with self.lock:
+            while (
+                len(self.transaction_map) > self.max_transactions
+                or self.total_bytes > self.max_bytes
+            ):
+                transaction_id = next(reversed(self.transaction_map))
+                self.remove_transaction(transaction_id)
+                evicted.append(transaction_id)
+
+        return evicted
+
+    def remove_transaction(self, transaction_id):
+        """
+        Delete a transaction from the transaction pool, if it is pooled.
+        Return whether it was pooled.
+        """
+        with self.lock:
+            transaction = self.transaction_map.pop(transaction_id, None)
+
+            if transaction is None:
+                return False
+
+            self.total_bytes -= self.sizes.pop(transaction_id)
+            self.forget_address(transaction)
+
+            return True
+
+    def forget_address(self, transaction):
+        """
+        Drop the transaction from the address index.
+        """
+        address = transaction.input["address"]
+
+        if self.address_map.get(address) is transaction:
+            del self.address_map[address]
 
     def existing_transaction(self, address):
         """
         Find a transaction generated by the address in the transaction pool
         """
-        for transaction in self.transaction_map.values():
-            if transaction.input["address"] == address:
-                return transaction
+        return self.address_map.get(address)
 
-    def transaction_data(self):
+    def transaction_data(self, max_transactions=None):
         """
         Return the transactions of thje transaction pool represented in their
-        json serialized form.
+        json serialized form, oldest first, up to max_transactions of them.
+        """
+        with self.lock:
+            transactions = list(self.transaction_map.values())[:max_transactions]
+
+        return list(map(lambda transaction: transaction.to_json(), transactions))
+
+    def clear_block_transactions(self, blocks):
+        """
+        Delete the transactions recorded by the blocks from the transaction pool.
+        Only the blocks just added to the chain need to be given.
+        """
+        self.remove_transactions(
+            transaction["id"] for block in blocks for transaction in block.data
+        )
+
+    def remove_transactions(self, transaction_ids):
+        """
+        Delete the transactions from the transaction pool, and notify the hooks
+        of the ones that were pooled.
         """
-        return list(map(lambda transaction: transaction.to_json(), self.transaction_map.values()))
+        with self.lock:
+            cleared = [
+                transaction_id
+                for transaction_id in transaction_ids
+                if self.remove_transaction(transaction_id)
+            ]
+
+            if cleared:
+                self.notify_hooks("transactions-cleared", cleared)
 
     def clear_blockchain_transactions(self, blockchain):
         """
         Delete blockchain recorded transactions from the transaction pool.
         """
-        for block in blockchain.chain:
-            for transaction in block.data:
-                try:
-                    del self.transaction_map[transaction["id"]]
-                except KeyError:
-                    pass
+        self.clear_block_transactions(blockchain.chain)
+
+    def add_hook(self, hook):
+        """
+        Register a function to call after every change of the pool.
+        The hook receives "transaction" and the transaction that was set, or
+        "transactions-cleared" and the ids of the transactions that were deleted.
+        """
+        self.hooks.append(hook)
+
+    def notify_hooks(self, event, data):
+        for hook in self.hooks:
+            hook(event, data)
@@ -1,5 +1,6 @@
 import json
 import uuid
+from functools import lru_cache
 
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.backends import default_backend
@@ -10,7 +11,7 @@ from cryptography.hazmat.primitives.asymmetric.utils import (
     encode_dss_signature,
 )
 
-from backend.config import STARTING_BALANCE
+from backend.config import PUBLIC_KEY_CACHE_SIZE, STARTING_BALANCE
 
 
 class Wallet:
@@ -53,9 +54,7 @@ class Wallet:
         """
         Verify a signature based on the original public key and data.
         """
-        deserialized_public_key = serialization.load_pem_public_key(
-            public_key.encode("utf-8"), default_backend()
-        )
+        deserialized_public_key = load_public_key(public_key)
 
         (r, s) = signature
 
@@ -69,6 +68,13 @@ class Wallet:
         except InvalidSignature:
             return False
 
+    @staticmethod
+    def public_key_cache_info():
+        """
+        Report the hits, misses and size of the public key cache.
+        """
+        return load_public_key.cache_info()._asdict()
+
     @staticmethod
     def calculate_balance(blockchain, address):
         """
@@ -76,21 +82,23 @@ class Wallet:
         data within the blockchain.
 
         The balance is found by adding the output values that belong to the
-        address since the most recent transaction by that address.
+        address since the most recent transaction by that address. The
+        blockchain keeps these balances indexed, so the lookup is O(1).
         """
-        balance = STARTING_BALANCE
-
         if not blockchain:
-            return balance
+            return STARTING_BALANCE
+
+        return blockchain.balance(address)
 
-        for block in blockchain.chain:
-            for transaction in block.data:
-                if transaction["input"]["address"] == address:
-                    balance = transaction["output"][address]
-                elif address in transaction["output"]:
-                    balance += transaction["output"][address]
 
-        return balance
+@lru_cache(maxsize=PUBLIC_KEY_CACHE_SIZE)
+def load_public_key(public_key):
+    """
+    Deserialize a PEM public key.
+    The same senders sign many transactions, so the parsed keys are kept in
+    a bounded LRU cache instead of parsing the PEM on every verification.
+    """
+    return serialization.load_pem_public_key(public_key.encode("utf-8"), default_backend())
 
 
 def main():
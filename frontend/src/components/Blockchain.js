@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Link } from 'react-router-dom';
 import { Button } from 'react-bootstrap';
 import { API_BASE_URL } from '../config';
@@ -9,19 +9,34 @@ const PAGE_RANGE = 3;
 function Blockchain() {
   const [blockchain, setBlockchain] = useState([]);
   const [blockchainLength, setBlockchainLength] = useState(0);
+  const page = useRef({ start: 0, end: PAGE_RANGE });
 
   const fetchBlockchainPage = ({ start, end }) => {
+    page.current = { start, end };
+
     fetch(`${API_BASE_URL}/blockchain/range?start=${start}&end=${end}`)
       .then(response => response.json())
       .then(json => setBlockchain(json));
   }
 
   useEffect(() => {
-    fetchBlockchainPage({ start: 0, end: PAGE_RANGE });
+    fetchBlockchainPage(page.current);
 
     fetch(`${API_BASE_URL}/blockchain/length`)
       .then(response => response.json())
       .then(json => setBlockchainLength(json));
+
+    const events = new EventSource(`${API_BASE_URL}/events`);
+
+    // Blocks are counted from the tip, so every change of the chain shifts the pages.
+    events.addEventListener('blocks', event => {
+      const { height, blocks } = JSON.parse(event.data);
+
+      setBlockchainLength(height + blocks.length);
+      fetchBlockchainPage(page.current);
+    });
+
+    return () => events.close();
   }, []);
 
   const buttonNumbers = [];
@@ -8,12 +8,17 @@ function ConductTransaction() {
   const [amount, setAmount] = useState(0);
   const [recipient, setRecipient] = useState('');
   const [knownAddresses, setKnownAddresses] = useState([]);
+  const [moreAddresses, setMoreAddresses] = useState(false);
 
   useEffect(() => {
-    fetch(`${API_BASE_URL}/known-addresses`)
-      .then(response => response.json())
+    fetch(`${API_BASE_URL}/known-addresses?prefix=${encodeURIComponent(recipient)}`)
+      .then(response => {
+        setMoreAddresses(response.headers.has('X-Next-Cursor'));
+
+        return response.json();
+      })
       .then(json => setKnownAddresses(json));
-  }, []);
+  }, [recipient]);
 
   const updateRecipient = event => {
     setRecipient(event.target.value);
@@ -78,6 +83,7 @@ function ConductTransaction() {
             </span>
           ))
         }
+        {moreAddresses && <div>... type more of the recipient to narrow the list</div>}
       </div>
     </div>
   )
@@ -5,7 +5,7 @@ import Transaction from './Transaction';
 import { API_BASE_URL, SECONDS_JS } from '../config';
 import history from '../history';
 
-const POLL_INTERVAL = 10 * SECONDS_JS;
+const MINING_JOB_POLL_INTERVAL = SECONDS_JS;
 
 function TransactionPool() {
   const [transactions, setTransactions] = useState([]);
@@ -21,22 +21,56 @@ function TransactionPool() {
   }
 
   useEffect(() => {
-    fetchTransactions();
+    const events = new EventSource(`${API_BASE_URL}/events`);
 
-    const intervalId = setInterval(fetchTransactions, POLL_INTERVAL);
+    events.addEventListener('transaction', event => {
+      const transaction = JSON.parse(event.data);
 
-    return () => clearInterval(intervalId);
+      setTransactions(transactions => {
+        const index = transactions.findIndex(({ id }) => id === transaction.id);
+
+        if (index === -1) {
+          return [...transactions, transaction];
+        }
+
+        return transactions.map((pooled, i) => i === index ? transaction : pooled);
+      });
+    });
+
+    events.addEventListener('transactions-cleared', event => {
+      const clearedIds = new Set(JSON.parse(event.data));
+
+      setTransactions(transactions => transactions.filter(({ id }) => !clearedIds.has(id)));
+    });
+
+    // Load the whole pool on every (re)connection, then apply the deltas.
+    events.onopen = fetchTransactions;
+
+    return () => events.close();
   }, []);
 
-  const fetchMineBlock = () => {
-    fetch(`${API_BASE_URL}/blockchain/mine`)
-      .then(() => {
-        alert('Success!');
+  const waitForMiningJob = jobId => {
+    fetch(`${API_BASE_URL}/mining/jobs/${jobId}`)
+      .then(response => response.json())
+      .then(job => {
+        if (job.status === 'queued' || job.status === 'mining') {
+          setTimeout(() => waitForMiningJob(jobId), MINING_JOB_POLL_INTERVAL);
+
+          return;
+        }
+
+        alert(job.status === 'mined' ? 'Success!' : `Mining failed: ${job.error}`);
 
         history.push('/blockchain');
       });
   }
 
+  const fetchMineBlock = () => {
+    fetch(`${API_BASE_URL}/blockchain/mine`)
+      .then(response => response.json())
+      .then(job => waitForMiningJob(job.id));
+  }
+
   return (
     <div className="TransactionPool">
       <Link to="/">Home</Link>